@@ -119,7 +119,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Créer le coordinateur
     from .coordinator import StorCubeDataUpdateCoordinator
     coordinator = StorCubeDataUpdateCoordinator(hass, entry)
-    hass.data[DOMAIN][entry.entry_id] = coordinator
+    # Données de l'entrée : le coordinateur sous sa propre clé, les plateformes y ajoutent les leurs
+    hass.data[DOMAIN][entry.entry_id] = {"coordinator": coordinator}
     
     # Configurer le coordinateur (démarrage des boucles de mise à jour)
     try:
@@ -141,14 +142,14 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        coordinator = hass.data[DOMAIN].get(entry.entry_id)
-        if coordinator:
-            await coordinator.async_shutdown()
-        hass.data[DOMAIN].pop(entry.entry_id)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id, None)
+        if entry_data:
+            await entry_data["coordinator"].async_shutdown()
         
-        # Décharger les services
-        from .services import async_unload_services
-        await async_unload_services(hass)
+        # Décharger les services une fois la dernière entrée retirée
+        if not hass.data[DOMAIN]:
+            from .services import async_unload_services
+            await async_unload_services(hass)
 
     return unload_ok
 
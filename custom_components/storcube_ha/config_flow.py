@@ -4,6 +4,7 @@ from __future__ import annotations
 import logging
 import voluptuous as vol
 import aiohttp
+import orjson
 import async_timeout
 import asyncio
 
@@ -17,6 +18,7 @@ from homeassistant.const import (
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .const import (
     DOMAIN,
@@ -89,32 +91,32 @@ class StorcubeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         try:
             timeout = async_timeout.timeout(10)
             async with timeout:
-                async with aiohttp.ClientSession() as session:
-                    _LOGGER.debug("Testing connection to %s with device ID %s", TOKEN_URL, data[CONF_DEVICE_ID])
+                session = async_get_clientsession(self.hass)
+                _LOGGER.debug("Testing connection to %s with device ID %s", TOKEN_URL, data[CONF_DEVICE_ID])
+                
+                auth_data = {
+                    "appCode": data[CONF_APP_CODE],
+                    "loginName": data[CONF_LOGIN_NAME],
+                    "password": data[CONF_AUTH_PASSWORD],
+                }
+                _LOGGER.debug("Authentication data: %s", auth_data)
+                
+                async with session.post(TOKEN_URL, json=auth_data) as response:
+                    _LOGGER.debug("Response status: %s", response.status)
+                    
+                    if response.status != 200:
+                        _LOGGER.error("Authentication failed with status %s", response.status)
+                        raise InvalidAuth
                     
-                    auth_data = {
-                        "appCode": data[CONF_APP_CODE],
-                        "loginName": data[CONF_LOGIN_NAME],
-                        "password": data[CONF_AUTH_PASSWORD],
-                    }
-                    _LOGGER.debug("Authentication data: %s", auth_data)
+                    json_response = await response.json(loads=orjson.loads)
+                    _LOGGER.debug("Response data: %s", json_response)
                     
-                    async with session.post(TOKEN_URL, json=auth_data) as response:
-                        _LOGGER.debug("Response status: %s", response.status)
-                        
-                        if response.status != 200:
-                            _LOGGER.error("Authentication failed with status %s", response.status)
-                            raise InvalidAuth
-                        
-                        json_response = await response.json()
-                        _LOGGER.debug("Response data: %s", json_response)
-                        
-                        if json_response.get("code") != 200:
-                            error_msg = json_response.get("message", "Unknown error")
-                            _LOGGER.error("API error: %s", error_msg)
-                            raise CannotConnect
-                        
-                        return True
+                    if json_response.get("code") != 200:
+                        error_msg = json_response.get("message", "Unknown error")
+                        _LOGGER.error("API error: %s", error_msg)
+                        raise CannotConnect
+                    
+                    return True
 
         except asyncio.TimeoutError:
             _LOGGER.error("Connection timeout")
@@ -191,22 +193,22 @@ class StorcubeOptionsFlowHandler(config_entries.OptionsFlow):
         try:
             timeout = async_timeout.timeout(10)
             async with timeout:
-                async with aiohttp.ClientSession() as session:
-                    auth_data = {
-                        "appCode": data[CONF_APP_CODE],
-                        "loginName": data[CONF_LOGIN_NAME],
-                        "password": data[CONF_AUTH_PASSWORD],
-                    }
+                session = async_get_clientsession(self.hass)
+                auth_data = {
+                    "appCode": data[CONF_APP_CODE],
+                    "loginName": data[CONF_LOGIN_NAME],
+                    "password": data[CONF_AUTH_PASSWORD],
+                }
+                
+                async with session.post(TOKEN_URL, json=auth_data) as response:
+                    if response.status != 200:
+                        raise InvalidAuth
+                    
+                    json_response = await response.json(loads=orjson.loads)
+                    if json_response.get("code") != 200:
+                        raise CannotConnect
                     
-                    async with session.post(TOKEN_URL, json=auth_data) as response:
-                        if response.status != 200:
-                            raise InvalidAuth
-                        
-                        json_response = await response.json()
-                        if json_response.get("code") != 200:
-                            raise CannotConnect
-                        
-                        return True
+                    return True
 
         except asyncio.TimeoutError:
             raise CannotConnect
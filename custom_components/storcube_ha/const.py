@@ -12,6 +12,7 @@ CONF_AUTH_PASSWORD = "auth_password"
 # Default values
 DEFAULT_PORT = 1883
 DEFAULT_APP_CODE = "Storcube"
+OUTPUT_POLL_INTERVAL = 30  # secondes entre deux appels à l'API output
 
 # URLs
 WS_URI = "ws://baterway.com:9501/equip/info/"
@@ -21,6 +22,9 @@ OUTPUT_URL = "http://baterway.com/api/scene/user/list/V2?equipId="
 SET_POWER_URL = "http://baterway.com/api/slb/equip/set/power"
 SET_THRESHOLD_URL = "http://baterway.com/api/scene/threshold/set"
 
+# Signal de mise à jour des capteurs, formaté avec l'identifiant de l'appareil
+SIGNAL_STATE_UPDATE = f"{DOMAIN}_state_update_{{}}"
+
 # MQTT Topics
 TOPIC_BASE = "storcube/{device_id}/"
 TOPIC_BATTERY = TOPIC_BASE + "status"
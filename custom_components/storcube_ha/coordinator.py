@@ -4,11 +4,13 @@ import logging
 from datetime import timedelta, datetime
 import requests
 import json
+import orjson
 import websockets
-import aiohttp
 
 import paho.mqtt.client as mqtt
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.config_entries import ConfigEntry
@@ -47,6 +49,7 @@ from .const import (
     OUTPUT_URL,
     SET_POWER_URL,
     SET_THRESHOLD_URL,
+    SIGNAL_STATE_UPDATE,
 )
 from .firmware import StorCubeFirmwareManager
 
@@ -149,7 +152,8 @@ class StorCubeDataUpdateCoordinator(DataUpdateCoordinator):
         if "last_rest_update" not in self.data:
             self.data["last_rest_update"] = None
         
-        _LOGGER.debug("Structure des données après vérification: %s", list(self.data.keys()))
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Structure des données après vérification: %s", list(self.data.keys()))
 
     def _get_device_info(self, equip_id, battery_data):
         """Créer les informations de l'appareil pour une batterie."""
@@ -330,22 +334,22 @@ class StorCubeDataUpdateCoordinator(DataUpdateCoordinator):
             output_url = OUTPUT_URL + self.config_entry.data[CONF_DEVICE_ID]
 
             # Appeler l'API de manière asynchrone
-            async with aiohttp.ClientSession() as session:
-                async with session.get(output_url, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        if data.get("code") == 200 and data.get("data"):
-                            scene_list = data["data"]
-                            if scene_list:
-                                # Retourner le premier élément de la liste
-                                return scene_list[0]
-                        
-                        _LOGGER.warning("Aucune donnée de scène trouvée")
-                        return None
-                    else:
-                        _LOGGER.error(f"Erreur HTTP lors de la récupération des données de scène: {response.status}")
-                        return None
+            session = async_get_clientsession(self.hass)
+            async with session.get(output_url, headers=headers) as response:
+                if response.status == 200:
+                    data = await response.json(loads=orjson.loads)
+                    
+                    if data.get("code") == 200 and data.get("data"):
+                        scene_list = data["data"]
+                        if scene_list:
+                            # Retourner le premier élément de la liste
+                            return scene_list[0]
+                    
+                    _LOGGER.warning("Aucune donnée de scène trouvée")
+                    return None
+                else:
+                    _LOGGER.error(f"Erreur HTTP lors de la récupération des données de scène: {response.status}")
+                    return None
 
         except Exception as e:
             _LOGGER.error("Erreur lors de la récupération des données de scène: %s", str(e))
@@ -449,13 +453,11 @@ class StorCubeDataUpdateCoordinator(DataUpdateCoordinator):
                         self.data["last_rest_update"] = datetime.now().isoformat()
                         
                         # Mettre à jour les capteurs avec les nouvelles données REST
-                        if self.config_entry.entry_id in self.hass.data[DOMAIN]:
-                            sensors = self.hass.data[DOMAIN][self.config_entry.entry_id].get("sensors", [])
-                            for sensor in sensors:
-                                await self.hass.async_add_executor_job(
-                                    sensor.handle_state_update,
-                                    {"rest_data": self.data["rest_api"][equip_id]}
-                                )
+                        async_dispatcher_send(
+                            self.hass,
+                            SIGNAL_STATE_UPDATE.format(self.config_entry.data[CONF_DEVICE_ID]),
+                            {"rest_data": self.data["rest_api"][equip_id]},
+                        )
                         
                         _LOGGER.info("Données REST mises à jour pour l'équipement %s", equip_id)
                 else:
@@ -470,14 +472,11 @@ class StorCubeDataUpdateCoordinator(DataUpdateCoordinator):
                     firmware_info = await self.check_firmware_upgrade()
                     if firmware_info:
                         # Mettre à jour les capteurs avec les données firmware
-                        if self.config_entry.entry_id in self.hass.data[DOMAIN]:
-                            sensors = self.hass.data[DOMAIN][self.config_entry.entry_id].get("sensors", [])
-                            for sensor in sensors:
-                                if hasattr(sensor, 'handle_state_update'):
-                                    await self.hass.async_add_executor_job(
-                                        sensor.handle_state_update,
-                                        {"firmware": self.data["firmware"]}
-                                    )
+                        async_dispatcher_send(
+                            self.hass,
+                            SIGNAL_STATE_UPDATE.format(self.config_entry.data[CONF_DEVICE_ID]),
+                            {"firmware": self.data["firmware"]},
+                        )
                         _LOGGER.info("Données firmware mises à jour")
                     else:
                         _LOGGER.warning("Échec de la vérification firmware automatique")
@@ -505,7 +504,8 @@ class StorCubeDataUpdateCoordinator(DataUpdateCoordinator):
                 _LOGGER.error("Clé 'combined' manquante dans self.data: %s", list(self.data.keys()) if self.data else "None")
                 self._ensure_data_structure()
             
-            _LOGGER.debug("Structure des données avant mise à jour: %s", list(self.data.keys()))
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("Structure des données avant mise à jour: %s", list(self.data.keys()))
             
             # Combiner les données des deux sources
             for equip_id in self._known_devices:
@@ -536,7 +536,7 @@ class StorCubeDataUpdateCoordinator(DataUpdateCoordinator):
         topic = msg.topic
         payload = msg.payload
         try:
-            data = json.loads(payload)
+            data = orjson.loads(payload)
             if "status" in topic:
                 self.data["status"] = "online" if data.get("value") == 1 else "offline"
             elif "power" in topic:
@@ -562,8 +562,9 @@ class StorCubeDataUpdateCoordinator(DataUpdateCoordinator):
                     while True:
                         try:
                             message = await websocket.recv()
-                            data = json.loads(message)
-                            _LOGGER.debug("Données WebSocket reçues: %s", data)
+                            data = orjson.loads(message)
+                            if _LOGGER.isEnabledFor(logging.DEBUG):
+                                _LOGGER.debug("Données WebSocket reçues: %s", data)
 
                             if "list" in data:
                                 for battery in data["list"]:
@@ -668,9 +669,10 @@ class StorCubeDataUpdateCoordinator(DataUpdateCoordinator):
             """Callback lors de la réception d'un message."""
             try:
                 # Traiter le message reçu
-                payload = msg.payload.decode('utf-8')
-                data = json.loads(payload)
-                _LOGGER.debug("Message MQTT reçu sur %s: %s", msg.topic, data)
+                # orjson accepte directement les bytes du message
+                data = orjson.loads(msg.payload)
+                if _LOGGER.isEnabledFor(logging.DEBUG):
+                    _LOGGER.debug("Message MQTT reçu sur %s: %s", msg.topic, data)
                 
                 # Mettre à jour les données du coordinateur
                 if "status" in msg.topic:
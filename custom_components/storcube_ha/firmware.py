@@ -1,9 +1,10 @@
 """Gestion des mises à jour de firmware pour StorCube."""
 import logging
 import json
-import aiohttp
+import orjson
 from typing import Dict, Optional, List
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.exceptions import HomeAssistantError
 
 from .const import (
@@ -37,19 +38,19 @@ class StorCubeFirmwareManager:
         headers = {"Content-Type": "application/json"}
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(TOKEN_URL, json=credentials, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data.get("code") == 200:
-                            _LOGGER.debug("Authentification réussie pour la vérification firmware")
-                            return data["data"]["token"]
-                        else:
-                            _LOGGER.error(f"Erreur d'authentification: {data.get('message', 'Réponse inconnue')}")
-                            return None
+            session = async_get_clientsession(self.hass)
+            async with session.post(TOKEN_URL, json=credentials, headers=headers) as response:
+                if response.status == 200:
+                    data = await response.json(loads=orjson.loads)
+                    if data.get("code") == 200:
+                        _LOGGER.debug("Authentification réussie pour la vérification firmware")
+                        return data["data"]["token"]
                     else:
-                        _LOGGER.error(f"Erreur HTTP lors de l'authentification: {response.status}")
+                        _LOGGER.error(f"Erreur d'authentification: {data.get('message', 'Réponse inconnue')}")
                         return None
+                else:
+                    _LOGGER.error(f"Erreur HTTP lors de l'authentification: {response.status}")
+                    return None
         except Exception as e:
             _LOGGER.error(f"Erreur lors de l'authentification: {e}")
             return None
@@ -71,51 +72,51 @@ class StorCubeFirmwareManager:
         try:
             # Construire l'URL avec le device_id
             firmware_url = FIRMWARE_URL + self.device_id
-            async with aiohttp.ClientSession() as session:
-                async with session.get(firmware_url, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data.get("code") == 200:
-                            firmware_data = data.get("data", {})
-                            
-                            latest_version = firmware_data.get("currentBigVersion", "")
-                            current_version = firmware_data.get("lastBigVersion", "Inconnue")
-                            upgrade_available = firmware_data.get("upgread", False)
-                            
-                            # Si currentBigVersion est vide, on utilise lastBigVersion comme version actuelle
-                            if not latest_version:
-                                latest_version = current_version
-                            
-                            remark_list = firmware_data.get("remarkList", [])
-                            firmware_notes = []
-                            
-                            if upgrade_available and remark_list:
-                                for remark in remark_list:
-                                    remark_content = remark.get("remark", "")
-                                    try:
-                                        # Essayer de parser le JSON dans remark
-                                        remark_json = json.loads(remark_content)
-                                        french_notes = remark_json.get("fr", "Notes non disponibles en français")
-                                        firmware_notes.append(french_notes)
-                                    except json.JSONDecodeError:
-                                        # Si ce n'est pas du JSON, afficher tel quel
-                                        firmware_notes.append(remark_content)
-                            
-                            result = {
-                                "upgrade_available": upgrade_available,
-                                "current_version": current_version,
-                                "latest_version": latest_version,
-                                "firmware_notes": firmware_notes
-                            }
-                            
-                            _LOGGER.info(f"Vérification firmware terminée: {result}")
-                            return result
-                        else:
-                            _LOGGER.error(f"Erreur API firmware: {data.get('message', 'Réponse inconnue')}")
-                            return None
+            session = async_get_clientsession(self.hass)
+            async with session.get(firmware_url, headers=headers) as response:
+                if response.status == 200:
+                    data = await response.json(loads=orjson.loads)
+                    if data.get("code") == 200:
+                        firmware_data = data.get("data", {})
+                        
+                        latest_version = firmware_data.get("currentBigVersion", "")
+                        current_version = firmware_data.get("lastBigVersion", "Inconnue")
+                        upgrade_available = firmware_data.get("upgread", False)
+                        
+                        # Si currentBigVersion est vide, on utilise lastBigVersion comme version actuelle
+                        if not latest_version:
+                            latest_version = current_version
+                        
+                        remark_list = firmware_data.get("remarkList", [])
+                        firmware_notes = []
+                        
+                        if upgrade_available and remark_list:
+                            for remark in remark_list:
+                                remark_content = remark.get("remark", "")
+                                try:
+                                    # Essayer de parser le JSON dans remark
+                                    remark_json = json.loads(remark_content)
+                                    french_notes = remark_json.get("fr", "Notes non disponibles en français")
+                                    firmware_notes.append(french_notes)
+                                except json.JSONDecodeError:
+                                    # Si ce n'est pas du JSON, afficher tel quel
+                                    firmware_notes.append(remark_content)
+                        
+                        result = {
+                            "upgrade_available": upgrade_available,
+                            "current_version": current_version,
+                            "latest_version": latest_version,
+                            "firmware_notes": firmware_notes
+                        }
+                        
+                        _LOGGER.info(f"Vérification firmware terminée: {result}")
+                        return result
                     else:
-                        _LOGGER.error(f"Erreur HTTP lors de la vérification firmware: {response.status}")
+                        _LOGGER.error(f"Erreur API firmware: {data.get('message', 'Réponse inconnue')}")
                         return None
+                else:
+                    _LOGGER.error(f"Erreur HTTP lors de la vérification firmware: {response.status}")
+                    return None
         except Exception as e:
             _LOGGER.error(f"Erreur lors de la vérification du firmware: {e}")
             raise HomeAssistantError(f"Erreur lors de la vérification du firmware: {e}")
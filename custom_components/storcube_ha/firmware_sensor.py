@@ -37,7 +37,7 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Configurer le capteur de firmware."""
-    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
     
     # Créer le capteur de firmware
     firmware_sensor = StorCubeFirmwareSensor(coordinator, config_entry)
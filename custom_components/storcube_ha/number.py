@@ -4,6 +4,8 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+import orjson
+
 from homeassistant.components.number import NumberEntity, NumberMode
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
@@ -12,6 +14,7 @@ from homeassistant.const import (
     PERCENTAGE,
 )
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 
@@ -136,8 +139,6 @@ class StorcubePowerNumber(NumberEntity):
 
     async def _get_auth_token(self) -> str | None:
         """Récupérer le token d'authentification."""
-        import aiohttp
-
         token_credentials = {
             "appCode": self._app_code,
             "loginName": self._login_name,
@@ -145,20 +146,20 @@ class StorcubePowerNumber(NumberEntity):
         }
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    TOKEN_URL,
-                    json=token_credentials,
-                    headers={'Content-Type': 'application/json'}
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data.get('code') == 200:
-                            return data['data']['token']
-                        else:
-                            _LOGGER.error(f"Erreur d'authentification: {data.get('message')}")
+            session = async_get_clientsession(self.hass)
+            async with session.post(
+                TOKEN_URL,
+                json=token_credentials,
+                headers={'Content-Type': 'application/json'}
+            ) as response:
+                if response.status == 200:
+                    data = await response.json(loads=orjson.loads)
+                    if data.get('code') == 200:
+                        return data['data']['token']
                     else:
-                        _LOGGER.error(f"Erreur HTTP lors de l'authentification: {response.status}")
+                        _LOGGER.error(f"Erreur d'authentification: {data.get('message')}")
+                else:
+                    _LOGGER.error(f"Erreur HTTP lors de l'authentification: {response.status}")
         except Exception as e:
             _LOGGER.error(f"Erreur lors de la récupération du token: {e}")
 
@@ -166,8 +167,6 @@ class StorcubePowerNumber(NumberEntity):
 
     async def _set_power_value(self, token: str, power_value: int) -> bool:
         """Modifier la valeur de puissance via l'API."""
-        import aiohttp
-
         headers = {
             "Authorization": token,
             "Content-Type": "application/json",
@@ -179,20 +178,20 @@ class StorcubePowerNumber(NumberEntity):
         }
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    SET_POWER_URL,
-                    headers=headers,
-                    params=params
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data.get("code") == 200:
-                            return True
-                        else:
-                            _LOGGER.error(f"Échec de la mise à jour: {data.get('message')}")
+            session = async_get_clientsession(self.hass)
+            async with session.get(
+                SET_POWER_URL,
+                headers=headers,
+                params=params
+            ) as response:
+                if response.status == 200:
+                    data = await response.json(loads=orjson.loads)
+                    if data.get("code") == 200:
+                        return True
                     else:
-                        _LOGGER.error(f"Erreur HTTP: {response.status}")
+                        _LOGGER.error(f"Échec de la mise à jour: {data.get('message')}")
+                else:
+                    _LOGGER.error(f"Erreur HTTP: {response.status}")
         except Exception as e:
             _LOGGER.error(f"Erreur lors de la modification de la puissance: {e}")
 
@@ -261,8 +260,6 @@ class StorcubeThresholdNumber(NumberEntity):
 
     async def _get_current_threshold(self, token: str) -> int | None:
         """Récupérer la valeur actuelle du seuil depuis l'API."""
-        import aiohttp
-
         headers = {
             "Authorization": token,
             "Content-Type": "application/json",
@@ -271,20 +268,20 @@ class StorcubeThresholdNumber(NumberEntity):
         params = {"equipId": self._device_id}
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    "http://baterway.com/api/scene/threshold/query",
-                    headers=headers,
-                    params=params
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if "data" in data:
-                            return int(data["data"])
-                        else:
-                            _LOGGER.debug(f"Réponse inattendue pour le seuil: {data}")
+            session = async_get_clientsession(self.hass)
+            async with session.get(
+                "http://baterway.com/api/scene/threshold/query",
+                headers=headers,
+                params=params
+            ) as response:
+                if response.status == 200:
+                    data = await response.json(loads=orjson.loads)
+                    if "data" in data:
+                        return int(data["data"])
                     else:
-                        _LOGGER.debug(f"Erreur HTTP {response.status} lors de la récupération du seuil")
+                        _LOGGER.debug(f"Réponse inattendue pour le seuil: {data}")
+                else:
+                    _LOGGER.debug(f"Erreur HTTP {response.status} lors de la récupération du seuil")
         except Exception as e:
             _LOGGER.error(f"Erreur lors de la récupération du seuil actuel: {e}")
 
@@ -313,8 +310,6 @@ class StorcubeThresholdNumber(NumberEntity):
 
     async def _get_auth_token(self) -> str | None:
         """Récupérer le token d'authentification."""
-        import aiohttp
-
         token_credentials = {
             "appCode": self._app_code,
             "loginName": self._login_name,
@@ -322,20 +317,20 @@ class StorcubeThresholdNumber(NumberEntity):
         }
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    TOKEN_URL,
-                    json=token_credentials,
-                    headers={'Content-Type': 'application/json'}
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data.get('code') == 200:
-                            return data['data']['token']
-                        else:
-                            _LOGGER.error(f"Erreur d'authentification: {data.get('message')}")
+            session = async_get_clientsession(self.hass)
+            async with session.post(
+                TOKEN_URL,
+                json=token_credentials,
+                headers={'Content-Type': 'application/json'}
+            ) as response:
+                if response.status == 200:
+                    data = await response.json(loads=orjson.loads)
+                    if data.get('code') == 200:
+                        return data['data']['token']
                     else:
-                        _LOGGER.error(f"Erreur HTTP lors de l'authentification: {response.status}")
+                        _LOGGER.error(f"Erreur d'authentification: {data.get('message')}")
+                else:
+                    _LOGGER.error(f"Erreur HTTP lors de l'authentification: {response.status}")
         except Exception as e:
             _LOGGER.error(f"Erreur lors de la récupération du token: {e}")
 
@@ -343,8 +338,6 @@ class StorcubeThresholdNumber(NumberEntity):
 
     async def _set_threshold_value(self, token: str, threshold_value: int) -> bool:
         """Modifier la valeur du seuil via l'API."""
-        import aiohttp
-
         headers = {
             "Authorization": token,
             "Content-Type": "application/json",
@@ -359,23 +352,23 @@ class StorcubeThresholdNumber(NumberEntity):
         ]
 
         try:
-            async with aiohttp.ClientSession() as session:
-                for payload in payloads:
-                    _LOGGER.debug(f"Tentative avec payload: {payload}")
-                    async with session.post(
-                        SET_THRESHOLD_URL,
-                        headers=headers,
-                        json=payload
-                    ) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            if data.get("code") == 200:
-                                _LOGGER.info(f"Seuil mis à jour avec succès avec {list(payload.keys())[0]}")
-                                return True
-                            else:
-                                _LOGGER.debug(f"Échec avec {list(payload.keys())[0]}: {data.get('message')}")
+            session = async_get_clientsession(self.hass)
+            for payload in payloads:
+                _LOGGER.debug(f"Tentative avec payload: {payload}")
+                async with session.post(
+                    SET_THRESHOLD_URL,
+                    headers=headers,
+                    json=payload
+                ) as response:
+                    if response.status == 200:
+                        data = await response.json(loads=orjson.loads)
+                        if data.get("code") == 200:
+                            _LOGGER.info(f"Seuil mis à jour avec succès avec {list(payload.keys())[0]}")
+                            return True
                         else:
-                            _LOGGER.debug(f"Erreur HTTP {response.status} avec {list(payload.keys())[0]}")
+                            _LOGGER.debug(f"Échec avec {list(payload.keys())[0]}: {data.get('message')}")
+                    else:
+                        _LOGGER.debug(f"Erreur HTTP {response.status} avec {list(payload.keys())[0]}")
 
             _LOGGER.error("Aucun des paramètres testés n'a fonctionné pour le seuil")
             return False
@@ -2,17 +2,24 @@
 from __future__ import annotations
 
 import logging
-import json
 import asyncio
+import random
+import time
 import aiohttp
+import orjson
 import websockets
-from datetime import datetime
-from typing import Any
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components import mqtt
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
@@ -29,8 +36,13 @@ from homeassistant.const import (
     UnitOfTemperature,
 )
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.dispatcher import async_dispatcher_connect, async_dispatcher_send
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .const import (
     DOMAIN,
@@ -48,13 +60,285 @@ from .const import (
     TOPIC_OUTPUT_POWER,
     TOPIC_THRESHOLD,
     OUTPUT_URL,
+    OUTPUT_POLL_INTERVAL,
+    SIGNAL_STATE_UPDATE,
     FIRMWARE_URL,
     SET_POWER_URL,
     SET_THRESHOLD_URL,
 )
 
+if TYPE_CHECKING:
+    from websockets.asyncio.client import ClientConnection
+
 _LOGGER = logging.getLogger(__name__)
 
+# Bornes (secondes) de l'attente exponentielle avec gigue après une erreur
+_BACKOFF_MIN = 5
+_BACKOFF_MAX = 300
+# Reconnexion WebSocket : premier essai rapide après une coupure brève, plafonné en cas de panne durable
+_WS_BACKOFF_MIN = 0.2
+_WS_BACKOFF_MAX = 60
+# Silence (secondes) après lequel la requête d'abonnement est renvoyée au serveur
+_WS_HEARTBEAT_INTERVAL = 30
+
+# Délai maximal d'une requête HTTP vers l'API, pour ne pas bloquer le cycle d'interrogation
+_REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10)
+# Durée (secondes) après laquelle le token est redemandé même sans refus de l'API
+_TOKEN_MAX_AGE = 3600
+
+# Période (secondes) pendant laquelle les trames suivant une diffusion sont regroupées
+_FRAME_COALESCE_DELAY = 0.2
+
+# Trames WebSocket sans données (accusés de réception, messages vides)
+_IGNORED_FRAMES = frozenset({'"SUCCESS"', "{}", "", b'"SUCCESS"', b"{}", b""})
+
+# Libellés du type de sortie, indexés par valeur texte (minuscules) ou numérique
+_OUTPUT_TYPE_MAP = {
+    "manual": "Manuel",
+    "auto": "Automatique",
+    "eco": "Économique",
+    0: "Normal",
+    1: "Économique",
+    2: "Performance",
+}
+
+# État de connexion indexé par (rgOnline, mainEquipOnline)
+_ONLINE_MAP = {(1, 1): "En ligne"}
+
+_WORK_STATUS_MAP = {
+    0: "Arrêté",
+    1: "En fonctionnement",
+    2: "En erreur",
+}
+
+_OPERATING_MODE_MAP = {
+    0: "Normal",
+    1: "Économie",
+    2: "Boost",
+    3: "Veille",
+}
+
+def _rest_to_frame(rest_data: dict[str, Any]) -> dict[str, Any]:
+    """Convertir les données de l'API output au format des trames WebSocket."""
+    return {
+        "list": [{
+            "outputType": rest_data.get("outputType"),
+            "equipId": rest_data.get("equipId"),
+            "reserved": rest_data.get("reserved"),
+            "outputPower": rest_data.get("outputPower"),
+            "workStatus": rest_data.get("workStatus"),
+            "rgOnline": rest_data.get("fgOnline"),
+            "mainEquipOnline": rest_data.get("mainEquipOnline"),
+            "equipModelCode": rest_data.get("equipModelCode"),
+            "version": rest_data.get("version", ""),
+            "isWork": 1 if rest_data.get("workStatus") == 1 else 0,
+            "errorCode": rest_data.get("errorCode", 0),
+            "operatingMode": rest_data.get("operatingMode", 0)
+        }]
+    }
+
+@lru_cache(maxsize=16)
+def _fmt_mode(mode: Any) -> str:
+    """Libellé d'un mode inconnu, mis en cache car la valeur se répète à chaque trame."""
+    return f"Mode {mode}"
+
+def _output_type_label(equip: dict[str, Any]) -> str | None:
+    """Libellé du type de sortie de l'équipement."""
+    output_type = equip.get("outputType")
+    if output_type is None:
+        return None
+    label = _OUTPUT_TYPE_MAP.get(output_type)
+    if label is None:
+        if isinstance(output_type, str):
+            return _OUTPUT_TYPE_MAP.get(output_type.lower(), output_type)
+        return _fmt_mode(output_type)
+    return label
+
+def _operating_mode_label(equip: dict[str, Any]) -> str | None:
+    """Libellé du mode de fonctionnement de l'équipement."""
+    mode = equip.get("operatingMode")
+    if mode is None:
+        return None
+    return _OPERATING_MODE_MAP.get(mode) or _fmt_mode(mode)
+
+@dataclass(frozen=True, kw_only=True)
+class StorcubeSensorEntityDescription(SensorEntityDescription):
+    """Description d'un capteur lisant une valeur de la trame."""
+
+    # Valeur calculée depuis le premier équipement de la trame ; None = pas de mise à jour
+    value_fn: Callable[[dict[str, Any]], Any]
+    # Clé agrégée à la racine de la trame, prioritaire sur value_fn si présente
+    total_key: str | None = None
+    extra_attributes: dict[str, Any] | None = None
+
+SENSOR_TYPES: tuple[StorcubeSensorEntityDescription, ...] = (
+    # Capteurs de batterie
+    StorcubeSensorEntityDescription(
+        key="battery_level",
+        name="Niveau Batterie Storcube",
+        native_unit_of_measurement=PERCENTAGE,
+        device_class=SensorDeviceClass.BATTERY,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:battery-high",
+        value_fn=lambda equip: equip.get("soc"),
+    ),
+    StorcubeSensorEntityDescription(
+        key="battery_power",
+        name="Puissance Batterie Storcube",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda equip: equip.get("invPower"),
+    ),
+    StorcubeSensorEntityDescription(
+        key="battery_threshold",
+        name="Seuil Batterie Storcube",
+        native_unit_of_measurement=PERCENTAGE,
+        device_class=SensorDeviceClass.BATTERY,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:battery-charging-medium",
+        value_fn=lambda equip: equip.get("reserved"),
+    ),
+    # Capteurs solaires
+    StorcubeSensorEntityDescription(
+        key="solar_power",
+        name="Puissance Solaire Storcube",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:solar-power",
+        suggested_display_precision=1,
+        has_entity_name=True,
+        total_key="totalPv1power",
+        value_fn=lambda equip: equip.get("pv1power"),
+        # Attributs pour le dashboard Énergie
+        extra_attributes={"last_reset": None, "is_solar_production": True},
+    ),
+    StorcubeSensorEntityDescription(
+        key="solar_power_2",
+        name="Puissance Solaire 2 Storcube",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:solar-power",
+        suggested_display_precision=1,
+        has_entity_name=True,
+        total_key="totalPv2power",
+        value_fn=lambda equip: equip.get("pv2power"),
+        extra_attributes={"last_reset": None, "is_solar_production": True},
+    ),
+    # Capteurs de sortie
+    StorcubeSensorEntityDescription(
+        key="output_power",
+        name="Puissance Sortie Storcube",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:flash",
+        suggested_display_precision=1,
+        has_entity_name=True,
+        total_key="totalInvPower",
+        value_fn=lambda equip: equip.get("invPower"),
+        extra_attributes={"last_reset": None, "is_battery_output": True},
+    ),
+    # Capteurs système
+    StorcubeSensorEntityDescription(
+        key="status",
+        name="État Système Storcube",
+        value_fn=lambda equip: "En marche" if equip.get("isWork") == 1 else "Arrêté",
+    ),
+    StorcubeSensorEntityDescription(
+        key="model",
+        name="Modèle",
+        icon="mdi:information",
+        value_fn=lambda equip: equip.get("equipModelCode"),
+    ),
+    StorcubeSensorEntityDescription(
+        key="serial_number",
+        name="Numéro de série",
+        icon="mdi:barcode",
+        value_fn=lambda equip: equip.get("equipId"),
+    ),
+    # Capteurs d'état
+    StorcubeSensorEntityDescription(
+        key="output_type",
+        name="Type de sortie",
+        icon="mdi:power-plug",
+        value_fn=_output_type_label,
+    ),
+    StorcubeSensorEntityDescription(
+        key="reserved",
+        name="Niveau de réserve",
+        native_unit_of_measurement=PERCENTAGE,
+        device_class=SensorDeviceClass.BATTERY,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:battery-charging-medium",
+        value_fn=lambda equip: equip.get("reserved"),
+    ),
+    StorcubeSensorEntityDescription(
+        key="work_status",
+        name="État de fonctionnement",
+        icon="mdi:power",
+        value_fn=lambda equip: _WORK_STATUS_MAP.get(equip.get("workStatus"), "Inconnu"),
+    ),
+    StorcubeSensorEntityDescription(
+        key="online_status",
+        name="État de connexion",
+        icon="mdi:wifi",
+        value_fn=lambda equip: _ONLINE_MAP.get(
+            (equip.get("rgOnline"), equip.get("mainEquipOnline")), "Hors ligne"
+        ),
+    ),
+    StorcubeSensorEntityDescription(
+        key="error_code",
+        name="Code d'erreur",
+        icon="mdi:alert-circle",
+        value_fn=lambda equip: equip.get("errorCode"),
+    ),
+    StorcubeSensorEntityDescription(
+        key="operating_mode",
+        name="Mode de fonctionnement",
+        icon="mdi:cog",
+        value_fn=_operating_mode_label,
+    ),
+)
+
+@dataclass(frozen=True, kw_only=True)
+class StorcubeEnergySensorEntityDescription(SensorEntityDescription):
+    """Description d'un capteur d'énergie intégrant une puissance de la trame."""
+
+    # Puissance agrégée à la racine de la trame, sinon lue sur le premier équipement
+    total_key: str
+    equip_key: str
+    native_unit_of_measurement: str | None = UnitOfEnergy.KILO_WATT_HOUR
+    device_class: SensorDeviceClass | None = SensorDeviceClass.ENERGY
+    state_class: SensorStateClass | str | None = SensorStateClass.TOTAL_INCREASING
+    suggested_display_precision: int | None = 2
+
+ENERGY_SENSOR_TYPES: tuple[StorcubeEnergySensorEntityDescription, ...] = (
+    StorcubeEnergySensorEntityDescription(
+        key="solar_energy",
+        name="Énergie Solaire Storcube",
+        icon="mdi:solar-power",
+        total_key="totalPv1power",
+        equip_key="pv1power",
+    ),
+    StorcubeEnergySensorEntityDescription(
+        key="solar_energy_2",
+        name="Énergie Solaire 2 Storcube",
+        icon="mdi:solar-power",
+        total_key="totalPv2power",
+        equip_key="pv2power",
+    ),
+    StorcubeEnergySensorEntityDescription(
+        key="output_energy",
+        name="Énergie Sortie Storcube",
+        icon="mdi:lightning-bolt",
+        total_key="totalInvPower",
+        equip_key="invPower",
+    ),
+)
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -63,198 +347,229 @@ async def async_setup_entry(
     """Set up sensors from a config entry."""
     config = config_entry.data
     
-    # Récupérer le coordinateur
-    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    # Récupérer le coordinateur, enregistré par __init__ sous sa propre clé
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    coordinator = entry_data["coordinator"]
 
     sensors = [
+        # Capteurs lisant directement une valeur de la trame
+        *(StorcubeValueSensor(config, description) for description in SENSOR_TYPES),
+
         # Capteurs de batterie
-        StorcubeBatteryLevelSensor(config),
-        StorcubeBatteryPowerSensor(config),
         StorcubeBatteryTemperatureSensor(config),
         StorcubeBatteryCapacityWhSensor(config),
         StorcubeBatteryStatusSensor(config),
-        StorcubeBatteryThresholdSensor(config),
-        
-        # Capteurs solaires
-        StorcubeSolarPowerSensor(config),
-        StorcubeSolarEnergySensor(config),
-        
-        # Capteurs solaires pour le deuxième panneau
-        StorcubeSolarPowerSensor2(config),
-        StorcubeSolarEnergySensor2(config),
-        
-        # Capteur d'énergie solaire totale
+
+        # Capteurs d'énergie (intégration de la puissance)
+        *(StorcubeEnergySensor(config, description) for description in ENERGY_SENSOR_TYPES),
         StorcubeSolarEnergyTotalSensor(config),
-        
-        # Capteurs de sortie
-        StorcubeOutputPowerSensor(config),
-        StorcubeOutputEnergySensor(config),
-        
-        # Capteurs système
-        StorcubeStatusSensor(config),
-        StorcubeModelSensor(config),
-        StorcubeSerialNumberSensor(config),
-        
-        # Capteurs d'état
-        StorcubeOutputTypeSensor(config),
-        StorcubeReservedSensor(config),
-        StorcubeWorkStatusSensor(config),
-        StorcubeOnlineSensor(config),
-        StorcubeErrorCodeSensor(config),
-        
+
         # Capteur de firmware
         StorcubeFirmwareSensor(config, coordinator),
-        StorcubeOperatingModeSensor(config),
     ]
 
     async_add_entities(sensors)
 
-    # Store sensors in hass.data
-    if DOMAIN not in hass.data:
-        hass.data[DOMAIN] = {}
-    hass.data[DOMAIN][config_entry.entry_id] = {"sensors": sensors}
+    # Session HTTP de Home Assistant, partagée par le WebSocket et l'API output
+    session = async_get_clientsession(hass)
+    token_provider = StorcubeTokenProvider(config)
+    output_coordinator = StorcubeOutputCoordinator(hass, config_entry, session, token_provider)
+    # Capteurs indexés par clé de payload consommée : une trame ne réveille que les capteurs concernés
+    dispatch: defaultdict[str, list[StorcubeBatterySensor]] = defaultdict(list)
+    for sensor in sensors:
+        for key in sensor._PAYLOAD_KEYS:
+            dispatch[key].append(sensor)
+    # Compléter les données de l'entrée sans écraser le coordinateur
+    entry_data.update({
+        "session": session,
+        "token": token_provider,
+    })
+
+    signal = SIGNAL_STATE_UPDATE.format(config[CONF_DEVICE_ID])
+
+    @callback
+    def _route_state_update(payload: dict[str, Any]) -> None:
+        """Transmettre une trame aux seuls capteurs qui consomment l'une de ses clés."""
+        # dict.fromkeys : un capteur abonné à plusieurs clés n'est appelé qu'une fois
+        targets = dict.fromkeys(
+            sensor for key in payload for sensor in dispatch.get(key, ())
+        )
+        # Ignorer les capteurs pas encore ajoutés à Home Assistant
+        ready = [sensor for sensor in targets if sensor.hass is not None]
+        # Deux passes : appliquer la trame partout, puis écrire chaque état une seule fois
+        for sensor in ready:
+            sensor.apply_state_update(payload)
+        for sensor in ready:
+            sensor.flush_state_update()
+
+    config_entry.async_on_unload(async_dispatcher_connect(hass, signal, _route_state_update))
+
+    @callback
+    def _handle_output_update() -> None:
+        """Diffuser aux capteurs les nouvelles données de l'API output."""
+        if output_coordinator.last_update_success and output_coordinator.data is not None:
+            rest_data = output_coordinator.data
+            # Conversion faite une seule fois pour tous les capteurs
+            async_dispatcher_send(hass, signal, {"rest_data": rest_data, "rest_frame": _rest_to_frame(rest_data)})
+
+    config_entry.async_on_unload(output_coordinator.async_add_listener(_handle_output_update))
+    config_entry.async_on_unload(output_coordinator.async_shutdown)
 
     # Créer la vue Lovelace
     await create_lovelace_view(hass, config_entry)
 
-    # Start websocket connection and output API connection
-    asyncio.create_task(websocket_to_mqtt(hass, config, config_entry))
-    asyncio.create_task(output_api_to_mqtt(hass, config, config_entry))
+    # Start websocket connection and output API polling, cancelled on unload
+    # Tâches nommées par entrée pour les distinguer dans les profils et les traces asyncio
+    config_entry.async_create_background_task(
+        hass,
+        websocket_to_mqtt(hass, config, config_entry),
+        f"{DOMAIN}_websocket_{config_entry.entry_id}",
+    )
+    config_entry.async_create_background_task(
+        hass,
+        output_coordinator.async_refresh(),
+        f"{DOMAIN}_output_first_refresh_{config_entry.entry_id}",
+    )
+
+# Vue Lovelace sérialisée une fois au chargement ; {device_id} est remplacé à la création
+_LOVELACE_VIEW_TEMPLATE = orjson.dumps({
+    "path": "storcube",
+    "title": "Storcube Battery Monitor",
+    "icon": "mdi:battery-charging",
+    "badges": [],
+    "cards": [
+        {
+            "type": "energy-distribution",
+            "title": "Distribution d'Énergie",
+            "entities": {
+                "solar_power": [
+                    "sensor.{device_id}_solar_power",
+                    "sensor.{device_id}_solar_power_2"
+                ],
+                "battery": {
+                    "entity": "sensor.{device_id}_battery_level"
+                },
+                "grid_power": "sensor.{device_id}_output_power"
+            }
+        },
+        {
+            "type": "grid",
+            "columns": 2,
+            "square": False,
+            "cards": [
+                {
+                    "type": "gauge",
+                    "entity": "sensor.{device_id}_battery_level",
+                    "name": "Niveau Batterie",
+                    "min": 0,
+                    "max": 100,
+                    "severity": {
+                        "green": 50,
+                        "yellow": 25,
+                        "red": 10
+                    }
+                },
+                {
+                    "type": "gauge",
+                    "entity": "sensor.{device_id}_reserved",
+                    "name": "Niveau Réserve",
+                    "min": 0,
+                    "max": 100,
+                    "severity": {
+                        "green": 50,
+                        "yellow": 25,
+                        "red": 10
+                    }
+                }
+            ]
+        },
+        {
+            "type": "grid",
+            "columns": 3,
+            "cards": [
+                {
+                    "type": "sensor",
+                    "entity": "sensor.{device_id}_solar_power",
+                    "name": "Solaire 1",
+                    "icon": "mdi:solar-power",
+                    "graph": "line"
+                },
+                {
+                    "type": "sensor",
+                    "entity": "sensor.{device_id}_solar_power_2",
+                    "name": "Solaire 2",
+                    "icon": "mdi:solar-power",
+                    "graph": "line"
+                },
+                {
+                    "type": "sensor",
+                    "entity": "sensor.{device_id}_output_power",
+                    "name": "Sortie",
+                    "icon": "mdi:power-plug",
+                    "graph": "line"
+                }
+            ]
+        },
+        {
+            "type": "grid",
+            "columns": 2,
+            "cards": [
+                {
+                    "type": "entities",
+                    "title": "État du système",
+                    "entities": [
+                        {
+                            "entity": "sensor.{device_id}_work_status",
+                            "name": "État"
+                        },
+                        {
+                            "entity": "sensor.{device_id}_online_status",
+                            "name": "Connexion"
+                        },
+                        {
+                            "entity": "sensor.{device_id}_output_type",
+                            "name": "Mode de sortie"
+                        }
+                    ]
+                },
+                {
+                    "type": "sensor",
+                    "entity": "sensor.{device_id}_battery_temperature",
+                    "name": "Température",
+                    "icon": "mdi:thermometer",
+                    "graph": "line"
+                }
+            ]
+        },
+        {
+            "type": "history-graph",
+            "title": "Historique des Puissances",
+            "hours_to_show": 24,
+            "entities": [
+                {
+                    "entity": "sensor.{device_id}_solar_power",
+                    "name": "Solaire 1"
+                },
+                {
+                    "entity": "sensor.{device_id}_solar_power_2",
+                    "name": "Solaire 2"
+                },
+                {
+                    "entity": "sensor.{device_id}_output_power",
+                    "name": "Sortie"
+                }
+            ]
+        }
+    ]
+})
 
 async def create_lovelace_view(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
     """Create the Lovelace view for Storcube."""
     device_id = config_entry.data[CONF_DEVICE_ID]
-    
-    view_config = {
-        "path": "storcube",
-        "title": "Storcube Battery Monitor",
-        "icon": "mdi:battery-charging",
-        "badges": [],
-        "cards": [
-            {
-                "type": "energy-distribution",
-                "title": "Distribution d'Énergie",
-                "entities": {
-                    "solar_power": [
-                        f"sensor.{device_id}_solar_power",
-                        f"sensor.{device_id}_solar_power_2"
-                    ],
-                    "battery": {
-                        "entity": f"sensor.{device_id}_battery_level"
-                    },
-                    "grid_power": f"sensor.{device_id}_output_power"
-                }
-            },
-            {
-                "type": "grid",
-                "columns": 2,
-                "square": False,
-                "cards": [
-                    {
-                        "type": "gauge",
-                        "entity": f"sensor.{device_id}_battery_level",
-                        "name": "Niveau Batterie",
-                        "min": 0,
-                        "max": 100,
-                        "severity": {
-                            "green": 50,
-                            "yellow": 25,
-                            "red": 10
-                        }
-                    },
-                    {
-                        "type": "gauge",
-                        "entity": f"sensor.{device_id}_reserved",
-                        "name": "Niveau Réserve",
-                        "min": 0,
-                        "max": 100,
-                        "severity": {
-                            "green": 50,
-                            "yellow": 25,
-                            "red": 10
-                        }
-                    }
-                ]
-            },
-            {
-                "type": "grid",
-                "columns": 3,
-                "cards": [
-                    {
-                        "type": "sensor",
-                        "entity": f"sensor.{device_id}_solar_power",
-                        "name": "Solaire 1",
-                        "icon": "mdi:solar-power",
-                        "graph": "line"
-                    },
-                    {
-                        "type": "sensor",
-                        "entity": f"sensor.{device_id}_solar_power_2",
-                        "name": "Solaire 2",
-                        "icon": "mdi:solar-power",
-                        "graph": "line"
-                    },
-                    {
-                        "type": "sensor",
-                        "entity": f"sensor.{device_id}_output_power",
-                        "name": "Sortie",
-                        "icon": "mdi:power-plug",
-                        "graph": "line"
-                    }
-                ]
-            },
-            {
-                "type": "grid",
-                "columns": 2,
-                "cards": [
-                    {
-                        "type": "entities",
-                        "title": "État du système",
-                        "entities": [
-                            {
-                                "entity": f"sensor.{device_id}_work_status",
-                                "name": "État"
-                            },
-                            {
-                                "entity": f"sensor.{device_id}_online_status",
-                                "name": "Connexion"
-                            },
-                            {
-                                "entity": f"sensor.{device_id}_output_type",
-                                "name": "Mode de sortie"
-                            }
-                        ]
-                    },
-                    {
-                        "type": "sensor",
-                        "entity": f"sensor.{device_id}_battery_temperature",
-                        "name": "Température",
-                        "icon": "mdi:thermometer",
-                        "graph": "line"
-                    }
-                ]
-            },
-            {
-                "type": "history-graph",
-                "title": "Historique des Puissances",
-                "hours_to_show": 24,
-                "entities": [
-                    {
-                        "entity": f"sensor.{device_id}_solar_power",
-                        "name": "Solaire 1"
-                    },
-                    {
-                        "entity": f"sensor.{device_id}_solar_power_2",
-                        "name": "Solaire 2"
-                    },
-                    {
-                        "entity": f"sensor.{device_id}_output_power",
-                        "name": "Sortie"
-                    }
-                ]
-            }
-        ]
-    }
+    # Échapper l'identifiant comme une chaîne JSON avant de l'insérer dans le modèle
+    view_config = orjson.loads(
+        _LOVELACE_VIEW_TEMPLATE.replace(b"{device_id}", orjson.dumps(str(device_id))[1:-1])
+    )
 
     try:
         # Ajouter la vue à la configuration Lovelace existante
@@ -269,762 +584,248 @@ async def create_lovelace_view(hass: HomeAssistant, config_entry: ConfigEntry) -
         )
         _LOGGER.info("Vue Lovelace Storcube créée avec succès")
     except Exception as e:
-        _LOGGER.error("Erreur lors de la création de la vue Lovelace: %s", str(e))
+        _LOGGER.error("Erreur lors de la création de la vue Lovelace: %s", e)
 
 class StorcubeBatterySensor(SensorEntity):
     """Capteur pour les données de la batterie solaire."""
 
+    # Les attributs _attr_* restent gérés par l'entité Home Assistant
+    __slots__ = ("_config", "_websocket_data", "_dirty")
+
+    # Capteurs alimentés par push (WebSocket, API output) : pas d'interrogation périodique
+    _attr_should_poll = False
+
+    # Clés de premier niveau des trames diffusées que ce capteur sait traiter
+    _PAYLOAD_KEYS: tuple[str, ...] = ("websocket_data", "rest_data", "list", "totalPv1power")
+
     def __init__(self, config: ConfigType) -> None:
         """Initialize the sensor."""
         self._config = config
         self._websocket_data = {}
-        self._rest_data = {}
         self._attr_native_value = None
+        self._dirty = False
 
     @callback
-    def handle_state_update(self, payload: dict[str, Any]) -> None:
-        """Gérer la mise à jour de l'état depuis les différentes sources."""
+    def apply_state_update(self, payload: dict[str, Any]) -> None:
+        """Appliquer les nouvelles données sans écrire l'état dans Home Assistant."""
         try:
             if "websocket_data" in payload:
                 self._websocket_data = payload["websocket_data"]
                 self._update_value_from_sources()
             elif "rest_data" in payload:
-                rest_data = payload["rest_data"]
-                # Créer une structure compatible avec le format WebSocket
-                websocket_format = {
-                    "list": [{
-                        "outputType": rest_data.get("outputType"),
-                        "equipId": rest_data.get("equipId"),
-                        "reserved": rest_data.get("reserved"),
-                        "outputPower": rest_data.get("outputPower"),
-                        "workStatus": rest_data.get("workStatus"),
-                        "rgOnline": rest_data.get("fgOnline"),
-                        "mainEquipOnline": rest_data.get("mainEquipOnline"),
-                        "equipModelCode": rest_data.get("equipModelCode"),
-                        "version": rest_data.get("version", ""),
-                        "isWork": 1 if rest_data.get("workStatus") == 1 else 0,
-                        "errorCode": rest_data.get("errorCode", 0),
-                        "operatingMode": rest_data.get("operatingMode", 0)
-                    }]
-                }
-                self._websocket_data = websocket_format
+                # Trame déjà convertie une fois par l'émetteur, sinon la construire
+                self._websocket_data = payload.get("rest_frame") or _rest_to_frame(payload["rest_data"])
                 self._update_value_from_sources()
             elif isinstance(payload, dict) and ("list" in payload or "totalPv1power" in payload):
                 self._websocket_data = payload
                 self._update_value_from_sources()
-            else:
+            elif _LOGGER.isEnabledFor(logging.DEBUG):
                 _LOGGER.debug("Format de données non reconnu: %s", payload)
         except Exception as e:
-            _LOGGER.error("Erreur lors de la mise à jour du capteur %s: %s", self.name, str(e))
+            self._log_update_error(e, payload)
 
-    def _update_value_from_sources(self):
-        """Mettre à jour la valeur en fonction des sources disponibles."""
-        # À implémenter dans les classes enfants
-        pass
+    def _log_update_error(self, err: Exception, payload: Any) -> None:
+        """Journaliser l'échec d'une mise à jour, avec le payload en débogage."""
+        _LOGGER.error("Erreur lors de la mise à jour du capteur %s: %s", self.name, err)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Payload reçu: %s", payload)
 
-class StorcubeBatteryLevelSensor(StorcubeBatterySensor):
-    """Représentation du niveau de la batterie."""
+    @callback
+    def flush_state_update(self) -> None:
+        """Écrire l'état dans Home Assistant uniquement s'il a changé."""
+        if self._dirty:
+            self._dirty = False
+            self.async_write_ha_state()
 
-    def __init__(self, config: ConfigType) -> None:
-        """Initialiser le capteur."""
-        super().__init__(config)
-        self._attr_name = "Niveau Batterie Storcube"
-        self._attr_native_unit_of_measurement = "%"
-        self._attr_device_class = SensorDeviceClass.BATTERY
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_unique_id = f"{config[CONF_DEVICE_ID]}_battery_level"
-        self._attr_icon = "mdi:battery-high"
+    def _set_native_value(self, value: Any) -> None:
+        """Mettre à jour la valeur et marquer le capteur comme modifié."""
+        if value != self._attr_native_value:
+            self._attr_native_value = value
+            self._dirty = True
 
     def _update_value_from_sources(self):
-        """Mettre à jour la valeur depuis les sources disponibles."""
-        try:
-            if self._websocket_data and "list" in self._websocket_data and self._websocket_data["list"]:
-                equip = self._websocket_data["list"][0]
-                if "soc" in equip:
-                    self._attr_native_value = equip["soc"]
-                    self.async_write_ha_state()
-        except Exception as e:
-            _LOGGER.error("Error updating battery level: %s", e)
-
-class StorcubeBatteryPowerSensor(StorcubeBatterySensor):
-    """Représentation de la puissance de la batterie."""
+        """Mettre à jour la valeur en fonction des sources disponibles."""
+        # À implémenter dans les classes enfants
+        pass
 
-    def __init__(self, config: ConfigType) -> None:
-        """Initialize the sensor."""
-        super().__init__(config)
-        self._attr_name = "Puissance Batterie Storcube"
-        self._attr_native_unit_of_measurement = UnitOfPower.WATT
-        self._attr_device_class = SensorDeviceClass.POWER
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_unique_id = f"{config[CONF_DEVICE_ID]}_battery_power"
+class StorcubeValueSensor(StorcubeBatterySensor):
+    """Capteur dont la valeur est décrite par une StorcubeSensorEntityDescription."""
 
-    def _update_value_from_sources(self):
-        """Mettre à jour la valeur depuis les sources disponibles."""
-        try:
-            if self._websocket_data and "list" in self._websocket_data and self._websocket_data["list"]:
-                equip = self._websocket_data["list"][0]
-                if "invPower" in equip:
-                    self._attr_native_value = equip["invPower"]
-                    self.async_write_ha_state()
-        except Exception as e:
-            _LOGGER.error("Error updating battery power: %s", e)
+    # Aucun état propre : tout vient de la description partagée
+    __slots__ = ()
 
-class StorcubeBatteryThresholdSensor(StorcubeBatterySensor):
-    """Représentation du seuil de la batterie."""
+    entity_description: StorcubeSensorEntityDescription
 
-    def __init__(self, config: ConfigType) -> None:
-        """Initialize the sensor."""
+    def __init__(self, config: ConfigType, description: StorcubeSensorEntityDescription) -> None:
+        """Initialiser le capteur."""
         super().__init__(config)
-        self._attr_name = "Seuil Batterie Storcube"
-        self._attr_native_unit_of_measurement = PERCENTAGE
-        self._attr_device_class = SensorDeviceClass.BATTERY
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_unique_id = f"{config[CONF_DEVICE_ID]}_battery_threshold"
-        self._attr_icon = "mdi:battery-charging-medium"
+        self.entity_description = description
+        self._attr_unique_id = f"{config[CONF_DEVICE_ID]}_{description.key}"
+        if description.extra_attributes is not None:
+            self._attr_extra_state_attributes = dict(description.extra_attributes)
 
     def _update_value_from_sources(self):
         """Mettre à jour la valeur depuis les sources disponibles."""
+        description = self.entity_description
         try:
-            if self._websocket_data and "list" in self._websocket_data and self._websocket_data["list"]:
-                equip = self._websocket_data["list"][0]
-                if "reserved" in equip:
-                    self._attr_native_value = equip["reserved"]
-                    self.async_write_ha_state()
+            if not self._websocket_data:
+                return
+            value = None
+            if description.total_key is not None:
+                value = self._websocket_data.get(description.total_key)
+            if value is None:
+                try:
+                    equip = self._websocket_data["list"][0]
+                except (KeyError, TypeError, IndexError):
+                    return
+                value = description.value_fn(equip)
+            if value is not None:
+                self._set_native_value(value)
         except Exception as e:
-            _LOGGER.error("Error updating battery threshold: %s", e)
+            _LOGGER.error("Error updating %s: %s", description.key, e)
 
 class StorcubeBatteryTemperatureSensor(StorcubeBatterySensor):
     """Représentation de la température de la batterie."""
 
+    __slots__ = ()
+
+    _PAYLOAD_KEYS = ("list",)
+
     def __init__(self, config: ConfigType) -> None:
         """Initialize the sensor."""
+        super().__init__(config)
         self._attr_name = "Température Batterie Storcube"
         self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
         self._attr_device_class = SensorDeviceClass.TEMPERATURE
         self._attr_state_class = SensorStateClass.MEASUREMENT
         self._attr_unique_id = f"{config[CONF_DEVICE_ID]}_battery_temperature"
-        self._config = config
-        self._attr_native_value = None
 
     @callback
-    def handle_state_update(self, payload: dict[str, Any]) -> None:
+    def apply_state_update(self, payload: dict[str, Any]) -> None:
         """Handle state update from MQTT."""
         try:
-            if isinstance(payload, dict) and "list" in payload and payload["list"]:
+            try:
                 equip = payload["list"][0]
-                self._attr_native_value = equip.get("temp")
-                self.async_write_ha_state()
+            except (KeyError, TypeError, IndexError):
+                return
+            self._set_native_value(equip.get("temp"))
         except Exception as e:
-            _LOGGER.error("Error updating battery temperature: %s", e)
-            _LOGGER.debug("Payload reçu: %s", payload)
-
-class StorcubeBatteryEnergySensor(SensorEntity):
-    """Représentation de l'énergie de la batterie."""
+            self._log_update_error(e, payload)
 
-    def __init__(self, config: ConfigType) -> None:
-        """Initialize the sensor."""
-        self._attr_name = "Énergie Batterie Storcube"
-        self._attr_native_unit_of_measurement = UnitOfEnergy.WATT_HOUR
-        self._attr_device_class = SensorDeviceClass.ENERGY
-        self._attr_state_class = SensorStateClass.TOTAL
-        self._attr_unique_id = f"{config[CONF_DEVICE_ID]}_battery_energy"
-        self._config = config
-        self._attr_native_value = None
+class StorcubeBatteryCapacityWhSensor(StorcubeBatterySensor):
+    """Représentation de la capacité de la batterie en Wh."""
 
-    @callback
-    def handle_state_update(self, payload: dict[str, Any]) -> None:
-        """Handle state update from MQTT."""
-        try:
-            self._attr_native_value = payload.get("battery_energy")
-            self.async_write_ha_state()
-        except Exception as e:
-            _LOGGER.error("Error updating battery energy: %s", e)
+    __slots__ = ()
 
-class StorcubeBatteryCapacityWhSensor(SensorEntity):
-    """Représentation de la capacité de la batterie en Wh."""
+    _PAYLOAD_KEYS = ("list",)
 
     def __init__(self, config: ConfigType) -> None:
         """Initialiser le capteur."""
+        super().__init__(config)
         self._attr_name = "Capacité Batterie Storcube (Wh)"
         self._attr_native_unit_of_measurement = UnitOfEnergy.WATT_HOUR
         self._attr_device_class = SensorDeviceClass.ENERGY_STORAGE
         self._attr_state_class = SensorStateClass.MEASUREMENT
         self._attr_unique_id = f"{config[CONF_DEVICE_ID]}_battery_capacity_wh"
-        self._config = config
-        self._attr_native_value = None
         self._attr_icon = "mdi:battery-charging"
 
     @callback
-    def handle_state_update(self, payload: dict[str, Any]) -> None:
+    def apply_state_update(self, payload: dict[str, Any]) -> None:
         """Gérer la mise à jour de l'état."""
         try:
-            if isinstance(payload, dict) and "list" in payload and payload["list"]:
+            try:
                 equip = payload["list"][0]
-                self._attr_native_value = float(equip.get("capacity", 0))
-                self.async_write_ha_state()
+            except (KeyError, TypeError, IndexError):
+                return
+            self._set_native_value(float(equip.get("capacity", 0)))
         except Exception as e:
             _LOGGER.error("Error updating battery capacity (Wh): %s", e)
 
-class StorcubeBatteryHealthSensor(SensorEntity):
-    """Représentation de la santé de la batterie."""
-
-    def __init__(self, config: ConfigType) -> None:
-        """Initialize the sensor."""
-        self._attr_name = "Santé Batterie Storcube"
-        self._attr_native_unit_of_measurement = PERCENTAGE
-        self._attr_device_class = SensorDeviceClass.BATTERY
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_unique_id = f"{config[CONF_DEVICE_ID]}_battery_health"
-        self._config = config
-        self._attr_native_value = None
+class StorcubeBatteryStatusSensor(StorcubeBatterySensor):
+    """Représentation de l'état de la batterie."""
 
-    @callback
-    def handle_state_update(self, payload: dict[str, Any]) -> None:
-        """Handle state update from MQTT."""
-        try:
-            if isinstance(payload, dict) and "list" in payload and payload["list"]:
-                equip = payload["list"][0]
-                if "capacity" in equip and "totalCapacity" in payload:
-                    current_capacity = float(equip["capacity"])
-                    total_capacity = float(payload["totalCapacity"])
-                    if total_capacity > 0:
-                        health = (current_capacity / total_capacity) * 100
-                        self._attr_native_value = round(health, 1)
-                    else:
-                        _LOGGER.warning("Capacité totale est 0")
-                        self._attr_native_value = None
-                else:
-                    _LOGGER.warning("Données de capacité non trouvées dans le payload")
-                    self._attr_native_value = None
-            else:
-                _LOGGER.warning("Structure de payload invalide pour la santé de la batterie: %s", payload)
-                self._attr_native_value = None
-            self.async_write_ha_state()
-        except Exception as e:
-            _LOGGER.error("Error updating battery health: %s", e)
-            _LOGGER.debug("Payload reçu: %s", payload)
+    __slots__ = ()
 
-class StorcubeBatteryStatusSensor(SensorEntity):
-    """Représentation de l'état de la batterie."""
+    _PAYLOAD_KEYS = ("list",)
 
     def __init__(self, config: ConfigType) -> None:
         """Initialize the sensor."""
+        super().__init__(config)
         self._attr_name = "État Batterie Storcube"
         self._attr_device_class = None
         self._attr_unique_id = f"{config[CONF_DEVICE_ID]}_battery_status"
-        self._config = config
-        self._attr_native_value = None
 
     @callback
-    def handle_state_update(self, payload: dict[str, Any]) -> None:
+    def apply_state_update(self, payload: dict[str, Any]) -> None:
         """Handle state update from MQTT."""
         try:
-            if isinstance(payload, dict) and "list" in payload and payload["list"]:
+            try:
                 # Prendre le premier équipement de la liste
                 equip = payload["list"][0]
-                if "isWork" in equip:
-                    self._attr_native_value = 'online' if equip["isWork"] == 1 else 'offline'
-                else:
-                    _LOGGER.warning("isWork non trouvé dans l'équipement: %s", equip)
-                    self._attr_native_value = 'unknown'
-            else:
+            except (KeyError, TypeError, IndexError):
                 _LOGGER.warning("Structure de payload invalide: %s", payload)
-                self._attr_native_value = 'unknown'
-            self.async_write_ha_state()
-        except Exception as e:
-            _LOGGER.error("Error updating battery status: %s", e)
-            _LOGGER.debug("Payload reçu: %s", payload)
-
-class StorcubeSolarPowerSensor(StorcubeBatterySensor):
-    """Représentation de la puissance solaire."""
-
-    def __init__(self, config: ConfigType) -> None:
-        """Initialize the sensor."""
-        super().__init__(config)
-        self._attr_name = "Puissance Solaire Storcube"
-        self._attr_native_unit_of_measurement = UnitOfPower.WATT
-        self._attr_device_class = SensorDeviceClass.POWER
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_unique_id = f"{config[CONF_DEVICE_ID]}_solar_power"
-        self._attr_icon = "mdi:solar-power"
-        self._attr_suggested_display_precision = 1
-        self._attr_has_entity_name = True
-
-    def _update_value_from_sources(self):
-        """Mettre à jour la valeur depuis les sources disponibles."""
-        try:
-            if self._websocket_data:
-                if "totalPv1power" in self._websocket_data:
-                    self._attr_native_value = self._websocket_data["totalPv1power"]
-                elif "list" in self._websocket_data and self._websocket_data["list"]:
-                    equip = self._websocket_data["list"][0]
-                    if "pv1power" in equip:
-                        self._attr_native_value = equip["pv1power"]
-                
-                # Ajouter des attributs pour le dashboard Énergie
-                self._attr_extra_state_attributes = {
-                    "last_reset": None,
-                    "is_solar_production": True
-                }
-                self.async_write_ha_state()
-        except Exception as e:
-            _LOGGER.error("Error updating solar power: %s", e)
-
-class StorcubeSolarEnergySensor(StorcubeBatterySensor):
-    """Représentation de l'énergie solaire produite."""
-
-    def __init__(self, config: ConfigType) -> None:
-        """Initialize the sensor."""
-        super().__init__(config)
-        self._attr_name = "Énergie Solaire Storcube"
-        self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
-        self._attr_device_class = SensorDeviceClass.ENERGY
-        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
-        self._attr_unique_id = f"{config[CONF_DEVICE_ID]}_solar_energy"
-        self._attr_icon = "mdi:solar-power"
-        self._attr_suggested_display_precision = 2
-        self._last_power = 0
-        self._last_update_time = None
-        self._attr_native_value = 0
-
-    def _update_value_from_sources(self):
-        """Mettre à jour la valeur depuis les sources disponibles."""
-        try:
-            if self._websocket_data:
-                current_power = 0
-                if "totalPv1power" in self._websocket_data:
-                    current_power = self._websocket_data["totalPv1power"]
-                elif "list" in self._websocket_data and self._websocket_data["list"]:
-                    equip = self._websocket_data["list"][0]
-                    current_power = equip.get("pv1power", 0)
-
-                current_time = datetime.now()
-                
-                if self._last_update_time is not None and current_power > 0:
-                    time_diff = (current_time - self._last_update_time).total_seconds() / 3600
-                    energy_increment = ((self._last_power + current_power) / 2) * time_diff / 1000
-                    
-                    if self._attr_native_value is None:
-                        self._attr_native_value = energy_increment
-                    else:
-                        self._attr_native_value += energy_increment
-                
-                self._last_power = current_power
-                self._last_update_time = current_time
-                self.async_write_ha_state()
-        except Exception as e:
-            _LOGGER.error("Error updating solar energy: %s", e)
-
-class StorcubeSolarPowerSensor2(StorcubeBatterySensor):
-    """Représentation de la puissance solaire du deuxième panneau."""
-
-    def __init__(self, config: ConfigType) -> None:
-        """Initialize the sensor."""
-        super().__init__(config)
-        self._attr_name = "Puissance Solaire 2 Storcube"
-        self._attr_native_unit_of_measurement = UnitOfPower.WATT
-        self._attr_device_class = SensorDeviceClass.POWER
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_unique_id = f"{config[CONF_DEVICE_ID]}_solar_power_2"
-        self._attr_icon = "mdi:solar-power"
-        self._attr_suggested_display_precision = 1
-        self._attr_has_entity_name = True
-
-    def _update_value_from_sources(self):
-        """Mettre à jour la valeur depuis les sources disponibles."""
-        try:
-            if self._websocket_data:
-                if "totalPv2power" in self._websocket_data:
-                    self._attr_native_value = self._websocket_data["totalPv2power"]
-                elif "list" in self._websocket_data and self._websocket_data["list"]:
-                    equip = self._websocket_data["list"][0]
-                    if "pv2power" in equip:
-                        self._attr_native_value = equip["pv2power"]
-                
-                # Ajouter des attributs pour le dashboard Énergie
-                self._attr_extra_state_attributes = {
-                    "last_reset": None,
-                    "is_solar_production": True
-                }
-                self.async_write_ha_state()
+                self._set_native_value('unknown')
+                return
+            if "isWork" in equip:
+                self._set_native_value('online' if equip["isWork"] == 1 else 'offline')
+            else:
+                _LOGGER.warning("isWork non trouvé dans l'équipement: %s", equip)
+                self._set_native_value('unknown')
         except Exception as e:
-            _LOGGER.error("Error updating solar power 2: %s", e)
+            self._log_update_error(e, payload)
 
-class StorcubeSolarEnergySensor2(StorcubeBatterySensor):
-    """Représentation de l'énergie solaire produite par le deuxième panneau."""
+class StorcubeEnergySensor(StorcubeBatterySensor):
+    """Capteur d'énergie cumulée décrit par une StorcubeEnergySensorEntityDescription."""
 
-    def __init__(self, config: ConfigType) -> None:
-        """Initialize the sensor."""
-        super().__init__(config)
-        self._attr_name = "Énergie Solaire 2 Storcube"
-        self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
-        self._attr_device_class = SensorDeviceClass.ENERGY
-        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
-        self._attr_unique_id = f"{config[CONF_DEVICE_ID]}_solar_energy_2"
-        self._attr_icon = "mdi:solar-power"
-        self._attr_suggested_display_precision = 2
-        self._last_power = 0
-        self._last_update_time = None
-        self._attr_native_value = 0
-
-    def _update_value_from_sources(self):
-        """Mettre à jour la valeur depuis les sources disponibles."""
-        try:
-            if self._websocket_data:
-                current_power = 0
-                if "totalPv2power" in self._websocket_data:
-                    current_power = self._websocket_data["totalPv2power"]
-                elif "list" in self._websocket_data and self._websocket_data["list"]:
-                    equip = self._websocket_data["list"][0]
-                    current_power = equip.get("pv2power", 0)
-
-                current_time = datetime.now()
-                
-                if self._last_update_time is not None and current_power > 0:
-                    time_diff = (current_time - self._last_update_time).total_seconds() / 3600
-                    energy_increment = ((self._last_power + current_power) / 2) * time_diff / 1000
-                    
-                    if self._attr_native_value is None:
-                        self._attr_native_value = energy_increment
-                    else:
-                        self._attr_native_value += energy_increment
-                
-                self._last_power = current_power
-                self._last_update_time = current_time
-                self.async_write_ha_state()
-        except Exception as e:
-            _LOGGER.error("Error updating solar energy 2: %s", e)
+    __slots__ = ("_last_power", "_last_update_time")
 
-class StorcubeOutputPowerSensor(StorcubeBatterySensor):
-    """Représentation de la puissance de sortie."""
+    # Trames WebSocket uniquement : l'API output ne fournit pas la puissance, qui serait lue à 0 W
+    _PAYLOAD_KEYS = ("websocket_data", "list", "totalPv1power")
 
-    def __init__(self, config: ConfigType) -> None:
-        """Initialize the sensor."""
-        super().__init__(config)
-        self._attr_name = "Puissance Sortie Storcube"
-        self._attr_native_unit_of_measurement = UnitOfPower.WATT
-        self._attr_device_class = SensorDeviceClass.POWER
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_unique_id = f"{config[CONF_DEVICE_ID]}_output_power"
-        self._attr_icon = "mdi:flash"
-        self._attr_suggested_display_precision = 1
-        self._attr_has_entity_name = True
+    entity_description: StorcubeEnergySensorEntityDescription
 
-    def _update_value_from_sources(self):
-        """Mettre à jour la valeur depuis les sources disponibles."""
-        try:
-            if self._websocket_data:
-                if "totalInvPower" in self._websocket_data:
-                    self._attr_native_value = self._websocket_data["totalInvPower"]
-                elif "list" in self._websocket_data and self._websocket_data["list"]:
-                    equip = self._websocket_data["list"][0]
-                    if "invPower" in equip:
-                        self._attr_native_value = equip["invPower"]
-                
-                # Ajouter des attributs pour le dashboard Énergie
-                self._attr_extra_state_attributes = {
-                    "last_reset": None,
-                    "is_battery_output": True
-                }
-                self.async_write_ha_state()
-        except Exception as e:
-            _LOGGER.error("Error updating output power: %s", e)
-
-class StorcubeOutputEnergySensor(StorcubeBatterySensor):
-    """Représentation de l'énergie de sortie cumulée."""
-
-    def __init__(self, config: ConfigType) -> None:
-        """Initialize the sensor."""
+    def __init__(self, config: ConfigType, description: StorcubeEnergySensorEntityDescription) -> None:
+        """Initialiser le capteur."""
         super().__init__(config)
-        self._attr_name = "Énergie Sortie Storcube"
-        self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
-        self._attr_device_class = SensorDeviceClass.ENERGY
-        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
-        self._attr_unique_id = f"{config[CONF_DEVICE_ID]}_output_energy"
-        self._attr_icon = "mdi:lightning-bolt"
-        self._attr_suggested_display_precision = 2
+        self.entity_description = description
+        self._attr_unique_id = f"{config[CONF_DEVICE_ID]}_{description.key}"
         self._last_power = 0
         self._last_update_time = None
-        self._attr_native_value = 0
+        self._attr_native_value = 0.0
 
     def _update_value_from_sources(self):
         """Mettre à jour la valeur depuis les sources disponibles."""
+        description = self.entity_description
         try:
             if self._websocket_data:
-                current_power = 0
-                if "totalInvPower" in self._websocket_data:
-                    current_power = self._websocket_data["totalInvPower"]
-                elif "list" in self._websocket_data and self._websocket_data["list"]:
-                    equip = self._websocket_data["list"][0]
-                    current_power = equip.get("invPower", 0)
+                current_power = self._websocket_data.get(description.total_key)
+                if current_power is None:
+                    current_power = 0
+                    if self._websocket_data.get("list"):
+                        current_power = self._websocket_data["list"][0].get(description.equip_key, 0)
 
-                current_time = datetime.now()
+                current_time = time.monotonic()
                 
-                if self._last_update_time is not None and current_power > 0:
-                    time_diff = (current_time - self._last_update_time).total_seconds() / 3600
-                    energy_increment = ((self._last_power + current_power) / 2) * time_diff / 1000
-                    
-                    if self._attr_native_value is None:
-                        self._attr_native_value = energy_increment
-                    else:
+                # Intégration trapézoïdale, y compris sur le front descendant
+                if self._last_update_time is not None:
+                    time_diff = (current_time - self._last_update_time) / 3600.0
+                    energy_increment = 0.5 * (self._last_power + current_power) * time_diff / 1000.0
+                    if energy_increment > 0:
                         self._attr_native_value += energy_increment
+                        self._dirty = True
                 
                 self._last_power = current_power
                 self._last_update_time = current_time
-                self.async_write_ha_state()
-        except Exception as e:
-            _LOGGER.error("Error updating output energy: %s", e)
-
-class StorcubeStatusSensor(StorcubeBatterySensor):
-    """Représentation de l'état du système."""
-
-    def __init__(self, config: ConfigType) -> None:
-        """Initialize the sensor."""
-        super().__init__(config)
-        self._attr_name = "État Système Storcube"
-        self._attr_device_class = None
-        self._attr_unique_id = f"{config[CONF_DEVICE_ID]}_status"
-
-    def _update_value_from_sources(self):
-        """Mettre à jour la valeur depuis les sources disponibles."""
-        try:
-            if self._websocket_data and "list" in self._websocket_data and self._websocket_data["list"]:
-                equip = self._websocket_data["list"][0]
-                self._attr_native_value = "En marche" if equip.get("isWork") == 1 else "Arrêté"
-                self.async_write_ha_state()
-        except Exception as e:
-            _LOGGER.error("Error updating status: %s", e)
-
-class StorcubeModelSensor(StorcubeBatterySensor):
-    """Représentation du modèle de l'équipement."""
-    
-    def __init__(self, config: ConfigType) -> None:
-        """Initialize the sensor."""
-        super().__init__(config)
-        self._attr_name = "Modèle"
-        self._attr_unique_id = f"{config[CONF_DEVICE_ID]}_model"
-        self._attr_icon = "mdi:information"
-
-    def _update_value_from_sources(self):
-        """Mettre à jour la valeur depuis les sources disponibles."""
-        try:
-            if self._websocket_data and "list" in self._websocket_data and self._websocket_data["list"]:
-                equip = self._websocket_data["list"][0]
-                if "equipModelCode" in equip:
-                    self._attr_native_value = equip["equipModelCode"]
-                    self.async_write_ha_state()
-        except Exception as e:
-            _LOGGER.error("Error updating model: %s", e)
-
-class StorcubeSerialNumberSensor(StorcubeBatterySensor):
-    """Représentation du numéro de série."""
-    
-    def __init__(self, config: ConfigType) -> None:
-        """Initialize the sensor."""
-        super().__init__(config)
-        self._attr_name = "Numéro de série"
-        self._attr_unique_id = f"{config[CONF_DEVICE_ID]}_serial_number"
-        self._attr_icon = "mdi:barcode"
-
-    def _update_value_from_sources(self):
-        """Mettre à jour la valeur depuis les sources disponibles."""
-        try:
-            if self._websocket_data and "list" in self._websocket_data and self._websocket_data["list"]:
-                equip = self._websocket_data["list"][0]
-                if "equipId" in equip:
-                    self._attr_native_value = equip["equipId"]
-                    self.async_write_ha_state()
-        except Exception as e:
-            _LOGGER.error("Error updating serial number: %s", e)
-
-class StorcubeOutputTypeSensor(StorcubeBatterySensor):
-    """Représentation du type de sortie."""
-
-    def __init__(self, config: ConfigType) -> None:
-        """Initialiser le capteur."""
-        super().__init__(config)
-        self._attr_name = "Type de sortie"
-        self._attr_unique_id = f"{config[CONF_DEVICE_ID]}_output_type"
-        self._attr_icon = "mdi:power-plug"
-
-    def _update_value_from_sources(self):
-        """Mettre à jour la valeur depuis les sources disponibles."""
-        try:
-            if self._websocket_data and "list" in self._websocket_data and self._websocket_data["list"]:
-                equip = self._websocket_data["list"][0]
-                if "outputType" in equip:
-                    output_type = equip["outputType"]
-                    # Gérer le cas où output_type est une chaîne de caractères
-                    if isinstance(output_type, str):
-                        type_map = {
-                            "manual": "Manuel",
-                            "auto": "Automatique",
-                            "eco": "Économique"
-                        }
-                        self._attr_native_value = type_map.get(output_type.lower(), output_type)
-                    else:
-                        # Gérer le cas où output_type est un nombre
-                        type_map = {
-                            0: "Normal",
-                            1: "Économique",
-                            2: "Performance"
-                        }
-                        self._attr_native_value = type_map.get(output_type, f"Mode {output_type}")
-                    self.async_write_ha_state()
-        except Exception as e:
-            _LOGGER.error("Error updating output type: %s", e)
-
-class StorcubeReservedSensor(StorcubeBatterySensor):
-    """Capteur pour le niveau de réserve."""
-
-    def __init__(self, config: ConfigType) -> None:
-        """Initialize the sensor."""
-        super().__init__(config)
-        self._attr_name = "Niveau de réserve"
-        self._attr_unique_id = f"{config[CONF_DEVICE_ID]}_reserved"
-        self._attr_native_value = None
-        self._attr_device_class = SensorDeviceClass.BATTERY
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_native_unit_of_measurement = PERCENTAGE
-        self._attr_icon = "mdi:battery-charging-medium"
-
-    def _update_value_from_sources(self):
-        """Mettre à jour la valeur depuis les sources disponibles."""
-        try:
-            if self._websocket_data and "list" in self._websocket_data and self._websocket_data["list"]:
-                equip = self._websocket_data["list"][0]
-                if "reserved" in equip:
-                    self._attr_native_value = equip["reserved"]
-                    self.async_write_ha_state()
-        except Exception as e:
-            _LOGGER.error("Error updating reserved level: %s", e)
-
-class StorcubeWorkStatusSensor(StorcubeBatterySensor):
-    """Représentation de l'état de fonctionnement."""
-
-    def __init__(self, config: ConfigType) -> None:
-        """Initialize the sensor."""
-        super().__init__(config)
-        self._attr_name = "État de fonctionnement"
-        self._attr_unique_id = f"{config[CONF_DEVICE_ID]}_work_status"
-        self._attr_icon = "mdi:power"
-
-    def _update_value_from_sources(self):
-        """Mettre à jour la valeur depuis les sources disponibles."""
-        try:
-            if self._websocket_data and "list" in self._websocket_data and self._websocket_data["list"]:
-                equip = self._websocket_data["list"][0]
-                work_status = equip.get("workStatus")
-                
-                status_map = {
-                    0: "Arrêté",
-                    1: "En fonctionnement",
-                    2: "En erreur"
-                }
-                
-                self._attr_native_value = status_map.get(work_status, "Inconnu")
-                self.async_write_ha_state()
-        except Exception as e:
-            _LOGGER.error("Error updating work status: %s", e)
-
-class StorcubeOnlineSensor(StorcubeBatterySensor):
-    """Représentation de l'état de connexion."""
-
-    def __init__(self, config: ConfigType) -> None:
-        """Initialize the sensor."""
-        super().__init__(config)
-        self._attr_name = "État de connexion"
-        self._attr_unique_id = f"{config[CONF_DEVICE_ID]}_online_status"
-        self._attr_icon = "mdi:wifi"
-
-    def _update_value_from_sources(self):
-        """Mettre à jour la valeur depuis les sources disponibles."""
-        try:
-            if self._websocket_data and "list" in self._websocket_data and self._websocket_data["list"]:
-                equip = self._websocket_data["list"][0]
-                rg_online = equip.get("rgOnline")
-                main_equip_online = equip.get("mainEquipOnline")
-                
-                if rg_online == 1 and main_equip_online == 1:
-                    self._attr_native_value = "En ligne"
-                else:
-                    self._attr_native_value = "Hors ligne"
-                self.async_write_ha_state()
-        except Exception as e:
-            _LOGGER.error("Error updating online status: %s", e)
-
-class StorcubeErrorCodeSensor(StorcubeBatterySensor):
-    """Représentation du code d'erreur."""
-    
-    def __init__(self, config: ConfigType) -> None:
-        """Initialize the sensor."""
-        super().__init__(config)
-        self._attr_name = "Code d'erreur"
-        self._attr_unique_id = f"{config[CONF_DEVICE_ID]}_error_code"
-        self._attr_icon = "mdi:alert-circle"
-
-    def _update_value_from_sources(self):
-        """Mettre à jour la valeur depuis les sources disponibles."""
-        try:
-            if self._websocket_data and "list" in self._websocket_data and self._websocket_data["list"]:
-                equip = self._websocket_data["list"][0]
-                if "errorCode" in equip:
-                    self._attr_native_value = equip["errorCode"]
-                    self.async_write_ha_state()
-        except Exception as e:
-            _LOGGER.error("Error updating error code: %s", e)
-
-class StorcubeOperatingModeSensor(StorcubeBatterySensor):
-    """Représentation du mode de fonctionnement."""
-    
-    def __init__(self, config: ConfigType) -> None:
-        """Initialize the sensor."""
-        super().__init__(config)
-        self._attr_name = "Mode de fonctionnement"
-        self._attr_unique_id = f"{config[CONF_DEVICE_ID]}_operating_mode"
-        self._attr_icon = "mdi:cog"
-
-    def _update_value_from_sources(self):
-        """Mettre à jour la valeur depuis les sources disponibles."""
-        try:
-            if self._websocket_data and "list" in self._websocket_data and self._websocket_data["list"]:
-                equip = self._websocket_data["list"][0]
-                if "operatingMode" in equip:
-                    mode = equip["operatingMode"]
-                    mode_map = {
-                        0: "Normal",
-                        1: "Économie",
-                        2: "Boost",
-                        3: "Veille"
-                    }
-                    self._attr_native_value = mode_map.get(mode, f"Mode {mode}")
-                    self.async_write_ha_state()
-        except Exception as e:
-            _LOGGER.error("Error updating operating mode: %s", e)
-
-class StorcubeFirmwareVersionSensor(StorcubeBatterySensor):
-    """Représentation de la version du firmware."""
-
-    def __init__(self, config: ConfigType) -> None:
-        """Initialize the sensor."""
-        super().__init__(config)
-        self._attr_name = "Version Firmware Storcube"
-        self._attr_device_class = None
-        self._attr_unique_id = f"{config[CONF_DEVICE_ID]}_firmware"
-
-    def _update_value_from_sources(self):
-        """Mettre à jour la valeur depuis les sources disponibles."""
-        try:
-            if self._websocket_data and "list" in self._websocket_data and self._websocket_data["list"]:
-                equip = self._websocket_data["list"][0]
-                if "version" in equip:
-                    self._attr_native_value = equip["version"]
-                    self.async_write_ha_state()
         except Exception as e:
-            _LOGGER.error("Error updating firmware version: %s", e)
+            _LOGGER.error("Error updating %s: %s", description.key, e)
 
 class StorcubeSolarEnergyTotalSensor(StorcubeBatterySensor):
     """Représentation de l'énergie solaire totale des deux panneaux."""
+
+    __slots__ = ("_last_power_pv1", "_last_power_pv2", "_last_update_time")
+
+    # Trames WebSocket uniquement, comme StorcubeEnergySensor
+    _PAYLOAD_KEYS = StorcubeEnergySensor._PAYLOAD_KEYS
     
     def __init__(self, config: ConfigType) -> None:
         """Initialize the sensor."""
@@ -1039,7 +840,7 @@ class StorcubeSolarEnergyTotalSensor(StorcubeBatterySensor):
         self._last_power_pv1 = 0
         self._last_power_pv2 = 0
         self._last_update_time = None
-        self._attr_native_value = 0
+        self._attr_native_value = 0.0
 
     def _update_value_from_sources(self):
         """Mettre à jour la valeur depuis les sources disponibles."""
@@ -1048,9 +849,11 @@ class StorcubeSolarEnergyTotalSensor(StorcubeBatterySensor):
                 current_power_pv1 = 0
                 current_power_pv2 = 0
                 
-                if "totalPv1power" in self._websocket_data and "totalPv2power" in self._websocket_data:
-                    current_power_pv1 = self._websocket_data["totalPv1power"]
-                    current_power_pv2 = self._websocket_data["totalPv2power"]
+                total_pv1 = self._websocket_data.get("totalPv1power")
+                total_pv2 = self._websocket_data.get("totalPv2power")
+                if total_pv1 is not None and total_pv2 is not None:
+                    current_power_pv1 = total_pv1
+                    current_power_pv2 = total_pv2
                 elif "list" in self._websocket_data and self._websocket_data["list"]:
                     equip = self._websocket_data["list"][0]
                     current_power_pv1 = equip.get("pv1power", 0)
@@ -1058,261 +861,403 @@ class StorcubeSolarEnergyTotalSensor(StorcubeBatterySensor):
 
                 total_current_power = current_power_pv1 + current_power_pv2
                 total_last_power = self._last_power_pv1 + self._last_power_pv2
-                current_time = datetime.now()
+                current_time = time.monotonic()
                 
-                if self._last_update_time is not None and total_current_power > 0:
-                    time_diff = (current_time - self._last_update_time).total_seconds() / 3600
-                    energy_increment = ((total_last_power + total_current_power) / 2) * time_diff / 1000
-                    
-                    if self._attr_native_value is None:
-                        self._attr_native_value = energy_increment
-                    else:
+                # Intégration trapézoïdale, y compris sur le front descendant
+                if self._last_update_time is not None:
+                    time_diff = (current_time - self._last_update_time) / 3600.0
+                    energy_increment = 0.5 * (total_last_power + total_current_power) * time_diff / 1000.0
+                    if energy_increment > 0:
                         self._attr_native_value += energy_increment
+                        self._dirty = True
                 
                 self._last_power_pv1 = current_power_pv1
                 self._last_power_pv2 = current_power_pv2
                 self._last_update_time = current_time
                 
-                self._attr_extra_state_attributes = {
+                extra_state_attributes = {
                     "last_reset": None,
                     "is_solar_production": True,
                     "pv1_power": current_power_pv1,
                     "pv2_power": current_power_pv2,
                     "total_power": total_current_power
                 }
-                
-                self.async_write_ha_state()
+                if extra_state_attributes != getattr(self, "_attr_extra_state_attributes", None):
+                    self._attr_extra_state_attributes = extra_state_attributes
+                    self._dirty = True
         except Exception as e:
             _LOGGER.error("Error updating total solar energy: %s", e)
 
+class StorcubeAuthError(HomeAssistantError):
+    """Erreur lors de l'obtention du token d'authentification."""
+
+class StorcubeTokenProvider:
+    """Token d'authentification partagé entre les boucles WebSocket et API output."""
+
+    def __init__(self, config: ConfigType) -> None:
+        """Initialiser le fournisseur de token."""
+        self._config = config
+        self._token: str | None = None
+        self._expiry = 0.0
+        self._lock = asyncio.Lock()
+
+    def _valid(self) -> bool:
+        """Indiquer si le token en cache est utilisable."""
+        return self._token is not None and time.monotonic() < self._expiry
+
+    async def get(self, session: aiohttp.ClientSession) -> str:
+        """Retourner le token en cache ou en demander un nouveau."""
+        if self._valid():
+            return self._token
+        async with self._lock:
+            # Une autre boucle a pu obtenir le token pendant l'attente du verrou
+            if not self._valid():
+                self._token = await self._fetch(session)
+                self._expiry = time.monotonic() + _TOKEN_MAX_AGE
+            return self._token
+
+    @callback
+    def invalidate(self) -> None:
+        """Oublier le token pour forcer une nouvelle authentification."""
+        self._token = None
+
+    async def _fetch(self, session: aiohttp.ClientSession) -> str:
+        """Demander un nouveau token à l'API."""
+        headers = {
+            'Content-Type': 'application/json',
+            'accept-language': 'fr-FR',
+            'user-agent': 'Mozilla/5.0 (Linux; Android 11; SM-A202F Build/RP1A.200720.012; wv) AppleWebKit/537.36 (KHTML, like Gecko) Version/4.0 Chrome/132.0.6834.163 Mobile Safari/537.36 uni-app Html5Plus/1.0 (Immersed/24.0)'
+        }
+
+        payload = {
+            "appCode": self._config[CONF_APP_CODE],
+            "loginName": self._config[CONF_LOGIN_NAME],
+            "password": self._config[CONF_AUTH_PASSWORD]
+        }
+
+        _LOGGER.debug("Tentative de connexion à %s", TOKEN_URL)
+        async with session.post(
+            TOKEN_URL,
+            headers=headers,
+            json=payload,
+            timeout=_REQUEST_TIMEOUT,
+        ) as response:
+            response_bytes = await response.read()
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("Réponse brute: %s", response_bytes.decode(errors="replace"))
+
+        try:
+            token_data = orjson.loads(response_bytes)
+            if token_data.get("code") != 200:
+                raise StorcubeAuthError(
+                    f"Échec de l'authentification: {token_data.get('message', 'Erreur inconnue')}"
+                )
+            token = token_data["data"]["token"]
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            # Corps non JSON ou structure inattendue
+            raise StorcubeAuthError(f"Réponse d'authentification invalide: {e}") from e
+        _LOGGER.info("Token obtenu avec succès")
+        return token
+
+class StorcubeOutputCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+    """Interrogation périodique de l'API output pour un appareil."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        session: aiohttp.ClientSession,
+        token_provider: StorcubeTokenProvider,
+    ) -> None:
+        """Initialiser le coordinateur."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=config_entry,
+            name=f"{DOMAIN} output",
+            update_interval=timedelta(seconds=OUTPUT_POLL_INTERVAL),
+            # Ne pas notifier les capteurs si les données n'ont pas changé
+            always_update=False,
+        )
+        self._session = session
+        self._token_provider = token_provider
+        self._url = f"{OUTPUT_URL}{config_entry.data[CONF_DEVICE_ID]}"
+        self._headers = {
+            'Content-Type': 'application/json',
+            'accept-language': 'fr-FR',
+            'user-agent': 'Mozilla/5.0 (Linux; Android 11; SM-A202F Build/RP1A.200720.012; wv) AppleWebKit/537.36 (KHTML, like Gecko) Version/4.0 Chrome/132.0.6834.163 Mobile Safari/537.36 uni-app Html5Plus/1.0 (Immersed/24.0)'
+        }
+        self._backoff = _BACKOFF_MIN
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Récupérer les données de l'équipement depuis l'API output."""
+        try:
+            self._headers["Authorization"] = await self._token_provider.get(self._session)
+            _LOGGER.debug("Appel à l'API output: %s", self._url)
+            async with self._session.get(
+                self._url, headers=self._headers, timeout=_REQUEST_TIMEOUT
+            ) as response:
+                # Réponse d'erreur HTTP : inutile de lire et d'analyser le corps
+                if response.status == 401:
+                    self._token_provider.invalidate()
+                    raise UpdateFailed("Token refusé par l'API output (HTTP 401), nouvelle authentification")
+                if response.status != 200:
+                    self._schedule_backoff()
+                    raise UpdateFailed(f"L'API output a répondu HTTP {response.status}")
+                response_bytes = await response.read()
+        except StorcubeAuthError as e:
+            self._schedule_backoff()
+            raise UpdateFailed(str(e)) from e
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self._schedule_backoff()
+            raise UpdateFailed(f"Erreur lors de l'appel à l'API output: {e}") from e
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Réponse API output brute: %s", response_bytes.decode(errors="replace"))
+
+        try:
+            json_data = orjson.loads(response_bytes)
+            code = json_data["code"]
+        except (ValueError, KeyError, TypeError) as e:
+            self._schedule_backoff()
+            raise UpdateFailed(f"Réponse JSON invalide de l'API output: {e}") from e
+
+        if code == 401:
+            # Token expiré : l'invalider pour les deux sources de données
+            self._token_provider.invalidate()
+            raise UpdateFailed("Token refusé par l'API output, nouvelle authentification")
+
+        data_list = json_data.get("data")
+        if code != 200 or not data_list or not isinstance(data_list, list):
+            self._schedule_backoff()
+            raise UpdateFailed(f"Réponse inattendue de l'API output (code {code})")
+
+        self._backoff = _BACKOFF_MIN
+        self.update_interval = timedelta(seconds=OUTPUT_POLL_INTERVAL)
+        return data_list[0]
+
+    def _schedule_backoff(self) -> None:
+        """Espacer le prochain appel : attente exponentielle avec gigue."""
+        # Un intervalle nul désactiverait l'interrogation : garder au moins une seconde
+        self.update_interval = timedelta(seconds=random.uniform(1, self._backoff))
+        self._backoff = min(self._backoff * 2, _BACKOFF_MAX)
+
+def _extract_equip_frame(json_data: Any, device_key: str) -> tuple[str, dict[str, Any]] | None:
+    """Identifier le type d'une trame WebSocket décodée et en extraire les données d'équipement."""
+    if not isinstance(json_data, dict):
+        _LOGGER.debug("Message reçu dans un format inattendu: %s", type(json_data))
+        return None
+
+    # Réponse d'API REST relayée par le WebSocket
+    if json_data.get("code") == 200 and "data" in json_data:
+        data_list = json_data["data"]
+        if data_list and isinstance(data_list, list) and isinstance(data_list[0], dict):
+            return "api", data_list[0]
+        _LOGGER.debug("Réponse d'API sans données d'équipement valides")
+        return None
+
+    # Trame indexée par l'ID de l'équipement configuré
+    if (equip_data := json_data.get(device_key)) is not None:
+        if not isinstance(equip_data, dict):
+            _LOGGER.debug("Données d'équipement dans un format inattendu: %s", type(equip_data))
+            return None
+        return "device", equip_data
+
+    # Trame indexée par un autre identifiant : ne la retenir que si elle ne concerne qu'un seul équipement
+    equip_data = next(iter(json_data.values())) if len(json_data) == 1 else None
+    if not equip_data or not isinstance(equip_data, dict):
+        _LOGGER.debug("Message reçu sans données d'équipement valides")
+        return None
+    # Données dans la liste des équipements, ou directement à la racine
+    return ("list" if equip_data.get("list") else "root"), equip_data
+
 async def websocket_to_mqtt(hass: HomeAssistant, config: ConfigType, config_entry: ConfigEntry) -> None:
     """Handle websocket connection and forward data to MQTT."""
-    while True:
-        try:
-            headers = {
-                'Content-Type': 'application/json',
-                'accept-language': 'fr-FR',
-                'user-agent': 'Mozilla/5.0 (Linux; Android 11; SM-A202F Build/RP1A.200720.012; wv) AppleWebKit/537.36 (KHTML, like Gecko) Version/4.0 Chrome/132.0.6834.163 Mobile Safari/537.36 uni-app Html5Plus/1.0 (Immersed/24.0)'
-            }
-            
-            payload = {
-                "appCode": config[CONF_APP_CODE],
-                "loginName": config[CONF_LOGIN_NAME],
-                "password": config[CONF_AUTH_PASSWORD]
-            }
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    session = entry_data["session"]
+    token_provider = entry_data["token"]
+    device_id = config[CONF_DEVICE_ID]
+    # Les clés JSON sont toujours des chaînes
+    device_key = str(device_id)
+    signal = SIGNAL_STATE_UPDATE.format(device_id)
+    # Requête d'abonnement sérialisée une seule fois pour toutes les connexions et heartbeats,
+    # envoyée en trame texte
+    request_message = orjson.dumps({"reportEquip": [device_id]})
+
+    # Trames en attente, une par type : la première d'une rafale est diffusée
+    # immédiatement, les suivantes une seule fois à la fin de la période
+    pending_frames: dict[str, dict[str, Any]] = {}
 
-            _LOGGER.debug("Tentative de connexion à %s", TOKEN_URL)
-            try:
-                connector = aiohttp.TCPConnector(ssl=False)
-                timeout = aiohttp.ClientTimeout(total=30)
-                
-                async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
-                    async with session.post(
-                        TOKEN_URL,
-                        headers=headers,
-                        json=payload
-                    ) as response:
-                        response_text = await response.text()
-                        _LOGGER.debug("Réponse brute: %s", response_text)
-                        
-                        token_data = json.loads(response_text)
-                        if token_data.get("code") != 200:
-                            _LOGGER.error("Échec de l'authentification: %s", token_data.get("message", "Erreur inconnue"))
-                            raise Exception("Échec de l'authentification")
-                        token = token_data["data"]["token"]
-                        _LOGGER.info("Token obtenu avec succès")
-
-                        # Connect to websocket with proper headers
-                        uri = f"{WS_URI}{token}"
-                        _LOGGER.debug("Connexion WebSocket à %s", uri)
-
-                        websocket_headers = {
-                            "Authorization": token,
-                            "Content-Type": "application/json",
-                            "accept-language": "fr-FR",
-                            "user-agent": "Mozilla/5.0 (Linux; Android 11; SM-A202F Build/RP1A.200720.012; wv) AppleWebKit/537.36 (KHTML, like Gecko) Version/4.0 Chrome/132.0.6834.163 Mobile Safari/537.36 uni-app Html5Plus/1.0 (Immersed/24.0)"
-                        }
+    @callback
+    def _flush_frames() -> None:
+        """Diffuser aux capteurs la dernière trame reçue de chaque type."""
+        frames = list(pending_frames.values())
+        pending_frames.clear()
+        for frame in frames:
+            async_dispatcher_send(hass, signal, frame)
+
+    flush_debouncer = Debouncer(
+        hass,
+        _LOGGER,
+        cooldown=_FRAME_COALESCE_DELAY,
+        immediate=True,
+        function=_flush_frames,
+    )
+    config_entry.async_on_unload(flush_debouncer.async_shutdown)
 
-                        async with websockets.connect(
-                            uri,
-                            additional_headers=websocket_headers,
-                            ping_interval=15,
-                            ping_timeout=5
-                        ) as websocket:
-                            _LOGGER.info("Connexion WebSocket établie")
-                            
-                            # Send initial request
-                            request_data = {"reportEquip": [config[CONF_DEVICE_ID]]}
-                            await websocket.send(json.dumps(request_data))
-                            _LOGGER.debug("Requête envoyée: %s", request_data)
-
-                            last_heartbeat = datetime.now()
-                            while True:
-                                try:
-                                    message = await asyncio.wait_for(websocket.recv(), timeout=30)
-                                    last_heartbeat = datetime.now()
-                                    _LOGGER.debug("Message WebSocket reçu brut: %s", message)
-
-                                    if message.strip():
-                                        try:
-                                            json_data = json.loads(message)
-                                            
-                                            # Ignorer silencieusement les messages "SUCCESS"
-                                            if json_data == "SUCCESS":
-                                                _LOGGER.debug("Message de confirmation 'SUCCESS' reçu")
-                                                continue
-                                                
-                                            # Ignorer les dictionnaires vides
-                                            if not json_data:
-                                                _LOGGER.debug("Message vide reçu")
-                                                continue
-                                            
-                                            if isinstance(json_data, dict):
-                                                # Log toutes les clés du message
-                                                _LOGGER.debug("Structure du message reçu: %s", json_data)
-                                                
-                                                # Vérifier si c'est une réponse d'API REST
-                                                if "code" in json_data and "data" in json_data and json_data["code"] == 200:
-                                                    data_list = json_data.get("data", [])
-                                                    if data_list and isinstance(data_list, list):
-                                                        equip_data = data_list[0]
-                                                        _LOGGER.info("Mise à jour des capteurs avec les données de l'API: %s", equip_data)
-                                                        for sensor in hass.data[DOMAIN][config_entry.entry_id]["sensors"]:
-                                                            sensor.handle_state_update(equip_data)
-                                                # Vérifier si c'est une réponse WebSocket avec l'ID de l'équipement
-                                                elif config[CONF_DEVICE_ID] in json_data:
-                                                    equip_data = json_data[config[CONF_DEVICE_ID]]
-                                                    _LOGGER.info("Mise à jour des capteurs avec les données WebSocket: %s", equip_data)
-                                                    for sensor in hass.data[DOMAIN][config_entry.entry_id]["sensors"]:
-                                                        sensor.handle_state_update(equip_data)
-                                                else:
-                                                    # Extraire les données d'équipement pour le format WebSocket
-                                                    equip_data = next(iter(json_data.values()), {})
-                                                    
-                                                    # Vérifier si les données d'équipement sont valides
-                                                    if equip_data and isinstance(equip_data, dict):
-                                                        # Si les données sont dans la liste
-                                                        if "list" in equip_data and equip_data["list"]:
-                                                            _LOGGER.info("Mise à jour des capteurs avec les données de la liste: %s", equip_data)
-                                                            for sensor in hass.data[DOMAIN][config_entry.entry_id]["sensors"]:
-                                                                sensor.handle_state_update(equip_data)
-                                                        # Si les données sont au niveau racine
-                                                        else:
-                                                            _LOGGER.info("Mise à jour des capteurs avec les données racines: %s", equip_data)
-                                                            for sensor in hass.data[DOMAIN][config_entry.entry_id]["sensors"]:
-                                                                sensor.handle_state_update(equip_data)
-                                                    else:
-                                                        _LOGGER.debug("Message reçu sans données d'équipement valides")
-                                            else:
-                                                _LOGGER.debug("Message reçu dans un format inattendu: %s", type(json_data))
-                                        except json.JSONDecodeError as e:
-                                            _LOGGER.warning("Impossible de décoder le message JSON: %s", e)
-                                            continue
-
-                                except asyncio.TimeoutError:
-                                    time_since_last = (datetime.now() - last_heartbeat).total_seconds()
-                                    _LOGGER.debug("Timeout WebSocket après %d secondes, envoi heartbeat...", time_since_last)
-                                    try:
-                                        await websocket.send(json.dumps(request_data))
-                                        _LOGGER.debug("Heartbeat envoyé avec succès")
-                                    except Exception as e:
-                                        _LOGGER.warning("Échec de l'envoi du heartbeat: %s", str(e))
-                                        break
-                                    continue
-
-            except Exception as e:
-                _LOGGER.error("Erreur inattendue: %s", str(e))
-                await asyncio.sleep(5)
+    @callback
+    def _queue_frame(kind: str, frame: dict[str, Any]) -> None:
+        """Mettre une trame en attente, en remplaçant la précédente du même type."""
+        pending_frames[kind] = frame
+        flush_debouncer.async_schedule_call()
+
+    # Délai avant la prochaine tentative, doublé à chaque échec consécutif
+    retry_delay = _WS_BACKOFF_MIN
+    failures = 0
+
+    async def _wait_before_retry(message: str, err: Exception, exc_info: bool = False) -> None:
+        """Journaliser l'échec une seule fois par panne, puis attendre avant de réessayer."""
+        nonlocal retry_delay, failures
+        if failures == 0:
+            _LOGGER.error(message, err, exc_info=exc_info)
+        else:
+            _LOGGER.debug(message, err, exc_info=exc_info)
+        failures += 1
+        await asyncio.sleep(random.uniform(retry_delay, retry_delay * 1.5))
+        retry_delay = min(retry_delay * 2, _WS_BACKOFF_MAX)
+
+    # Instant de la dernière trame reçue ; la détection de coupure reste assurée par les pings
+    last_frame = time.monotonic()
+
+    async def _heartbeat(websocket: ClientConnection) -> None:
+        """Renvoyer la requête d'abonnement après une période sans trame."""
+        while True:
+            idle = time.monotonic() - last_frame
+            if idle < _WS_HEARTBEAT_INTERVAL:
+                await asyncio.sleep(_WS_HEARTBEAT_INTERVAL - idle)
                 continue
+            _LOGGER.debug("Aucune trame depuis %d secondes, envoi heartbeat...", idle)
+            try:
+                await websocket.send(request_message, text=True)
+            except websockets.exceptions.ConnectionClosed as e:
+                _LOGGER.warning("Échec de l'envoi du heartbeat: %s", e)
+                return
+            await asyncio.sleep(_WS_HEARTBEAT_INTERVAL)
 
-        except Exception as e:
-            _LOGGER.error("Erreur de connexion: %s", str(e))
-            await asyncio.sleep(5)
+    @callback
+    def _handle_message(message: bytes) -> None:
+        """Décoder une trame reçue et la mettre en attente de diffusion."""
+        nonlocal retry_delay, failures
+        # Niveau évalué une fois par trame : aucun formatage de payload sinon
+        debug = _LOGGER.isEnabledFor(logging.DEBUG)
+        if debug:
+            _LOGGER.debug("Message WebSocket reçu brut: %s", message)
+
+        # Ignorer les accusés de réception sans passer par le parseur JSON
+        if message in _IGNORED_FRAMES or not message.strip():
+            return
+        try:
+            json_data = orjson.loads(message)
+        except orjson.JSONDecodeError as e:
+            _LOGGER.warning("Impossible de décoder le message JSON: %s", e)
+            return
+
+        # Ignorer les confirmations "SUCCESS" et les messages vides
+        if json_data == "SUCCESS" or not json_data:
+            _LOGGER.debug("Message sans données ignoré: %s", json_data)
+            return
+        if debug:
+            _LOGGER.debug("Structure du message reçu: %s", json_data)
+
+        frame = _extract_equip_frame(json_data, device_key)
+        if frame is None:
+            return
+        kind, equip_data = frame
+        # Première trame exploitable : la connexion est réellement rétablie, réarmer le délai
+        if failures:
+            _LOGGER.info("Connexion WebSocket rétablie après %d échec(s)", failures)
+            retry_delay = _WS_BACKOFF_MIN
+            failures = 0
+        if debug:
+            _LOGGER.debug("Mise à jour des capteurs avec les données (%s): %s", kind, equip_data)
+        _queue_frame(kind, equip_data)
+
+    async def _recv_loop(websocket: ClientConnection) -> None:
+        """Lire les trames jusqu'à la fermeture de la connexion."""
+        nonlocal last_frame
+        while True:
+            # Recevoir les trames texte en bytes : orjson les analyse sans décodage UTF-8
+            # Pas de délai par trame : ping_interval/ping_timeout détectent une connexion morte
+            message = await websocket.recv(decode=False)
+            last_frame = time.monotonic()
+            _handle_message(message)
+
+    async def _run_session(token: str) -> None:
+        """Ouvrir une connexion WebSocket et la consommer jusqu'à sa fermeture."""
+        nonlocal last_frame
+        uri = f"{WS_URI}{token}"
+        _LOGGER.debug("Connexion WebSocket à %s", uri)
+
+        websocket_headers = {
+            "Authorization": token,
+            "Content-Type": "application/json",
+            "accept-language": "fr-FR",
+            "user-agent": "Mozilla/5.0 (Linux; Android 11; SM-A202F Build/RP1A.200720.012; wv) AppleWebKit/537.36 (KHTML, like Gecko) Version/4.0 Chrome/132.0.6834.163 Mobile Safari/537.36 uni-app Html5Plus/1.0 (Immersed/24.0)"
+        }
+
+        async with websockets.connect(
+            uri,
+            additional_headers=websocket_headers,
+            ping_interval=15,
+            ping_timeout=5
+        ) as websocket:
+            # Le délai n'est réarmé qu'à la première trame valide : un serveur qui accepte
+            # puis ferme aussitôt la connexion reste soumis au backoff
+            if failures:
+                _LOGGER.debug("Connexion WebSocket ouverte, en attente de données")
+            else:
+                _LOGGER.info("Connexion WebSocket établie")
+
+            # Send initial request
+            await websocket.send(request_message, text=True)
+            _LOGGER.debug("Requête envoyée: %s", request_message)
+
+            last_frame = time.monotonic()
+            heartbeat = config_entry.async_create_background_task(
+                hass, _heartbeat(websocket), f"{DOMAIN}_websocket_heartbeat_{config_entry.entry_id}"
+            )
+            try:
+                await _recv_loop(websocket)
+            finally:
+                heartbeat.cancel()
 
-async def output_api_to_mqtt(hass: HomeAssistant, config: ConfigType, config_entry: ConfigEntry) -> None:
-    """Handle output API connection and forward data to MQTT."""
     while True:
         try:
-            headers = {
-                'Content-Type': 'application/json',
-                'accept-language': 'fr-FR',
-                'user-agent': 'Mozilla/5.0 (Linux; Android 11; SM-A202F Build/RP1A.200720.012; wv) AppleWebKit/537.36 (KHTML, like Gecko) Version/4.0 Chrome/132.0.6834.163 Mobile Safari/537.36 uni-app Html5Plus/1.0 (Immersed/24.0)'
-            }
-            
-            payload = {
-                "appCode": config[CONF_APP_CODE],
-                "loginName": config[CONF_LOGIN_NAME],
-                "password": config[CONF_AUTH_PASSWORD]
-            }
+            await _run_session(await token_provider.get(session))
 
-            _LOGGER.debug("Tentative de connexion à %s", TOKEN_URL)
-            try:
-                connector = aiohttp.TCPConnector(ssl=False)
-                timeout = aiohttp.ClientTimeout(total=30)
-                
-                async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
-                    async with session.post(
-                        TOKEN_URL,
-                        headers=headers,
-                        json=payload
-                    ) as response:
-                        response_text = await response.text()
-                        _LOGGER.debug("Réponse brute: %s", response_text)
-                        
-                        token_data = json.loads(response_text)
-                        if token_data.get("code") != 200:
-                            _LOGGER.error("Échec de l'authentification: %s", token_data.get("message", "Erreur inconnue"))
-                            raise Exception("Échec de l'authentification")
-                        token = token_data["data"]["token"]
-                        _LOGGER.info("Token obtenu avec succès")
-
-                        while True:
-                            try:
-                                # Appel à l'API output avec le token dans les headers
-                                output_url = f"{OUTPUT_URL}{config[CONF_DEVICE_ID]}"
-                                _LOGGER.debug("Appel à l'API output: %s", output_url)
-                                
-                                headers["Authorization"] = token
-                                async with session.get(
-                                    output_url,
-                                    headers=headers
-                                ) as response:
-                                    response_text = await response.text()
-                                    _LOGGER.debug("Réponse API output brute: %s", response_text)
-                                    
-                                    try:
-                                        json_data = json.loads(response_text)
-                                        if json_data.get("code") == 200 and "data" in json_data:
-                                            data_list = json_data.get("data", [])
-                                            if data_list and isinstance(data_list, list):
-                                                equip_data = data_list[0]
-                                                _LOGGER.info("Mise à jour des capteurs avec les données de l'API output: %s", equip_data)
-                                                for sensor in hass.data[DOMAIN][config_entry.entry_id]["sensors"]:
-                                                    sensor.handle_state_update({"rest_data": equip_data})
-                                    except json.JSONDecodeError as e:
-                                        _LOGGER.warning("Impossible de décoder la réponse JSON de l'API output: %s", e)
-                                
-                                # Attendre 30 secondes avant le prochain appel
-                                await asyncio.sleep(30)
-                                
-                            except Exception as e:
-                                _LOGGER.error("Erreur lors de l'appel à l'API output: %s", str(e))
-                                await asyncio.sleep(5)
-                                continue
-
-            except Exception as e:
-                _LOGGER.error("Erreur inattendue: %s", str(e))
-                await asyncio.sleep(5)
-                continue
+        except websockets.exceptions.InvalidHandshake as e:
+            # Handshake refusé : le token n'est probablement plus valide
+            token_provider.invalidate()
+            await _wait_before_retry("Connexion WebSocket refusée: %s", e)
 
-        except Exception as e:
-            _LOGGER.error("Erreur de connexion: %s", str(e))
-            await asyncio.sleep(5) 
+        except StorcubeAuthError as e:
+            # Identifiants refusés ou réponse invalide : pas de trace complète
+            await _wait_before_retry("Authentification impossible: %s", e)
+
+        except (websockets.exceptions.ConnectionClosed, aiohttp.ClientError, OSError, asyncio.TimeoutError) as e:
+            # Erreur réseau attendue : pas de trace complète
+            await _wait_before_retry("Connexion WebSocket perdue: %s", e)
 
+        except Exception as e:
+            await _wait_before_retry("Erreur inattendue: %s", e, exc_info=True)
 
 class StorcubeFirmwareSensor(StorcubeBatterySensor):
     """Capteur pour les informations de firmware StorCube."""
 
+    __slots__ = ("_firmware_data",)
+
+    _PAYLOAD_KEYS = (*StorcubeBatterySensor._PAYLOAD_KEYS, "firmware")
+
     def __init__(self, config: ConfigType, coordinator=None) -> None:
         """Initialiser le capteur de firmware."""
         super().__init__(config)
@@ -1329,35 +1274,38 @@ class StorcubeFirmwareSensor(StorcubeBatterySensor):
     def _update_value_from_sources(self):
         """Mettre à jour la valeur du capteur."""
         # Ne pas écraser les données firmware avec les données WebSocket/REST
-        # Les données firmware sont gérées par handle_state_update
+        # Les données firmware sont gérées par apply_state_update
         if hasattr(self, '_firmware_data') and self._firmware_data:
             current_version = self._firmware_data.get("current_version", "Inconnue")
             latest_version = self._firmware_data.get("latest_version", "Inconnue")
             upgrade_available = self._firmware_data.get("upgrade_available", False)
             
             if upgrade_available:
-                self._attr_native_value = f"Mise à jour disponible ({latest_version})"
+                self._set_native_value(f"Mise à jour disponible ({latest_version})")
             else:
-                self._attr_native_value = f"À jour ({current_version})"
+                self._set_native_value(f"À jour ({current_version})")
             return
         
-        # Récupérer les données de firmware depuis le coordinateur
-        if self.hass and DOMAIN in self.hass.data:
-            for entry_id, coordinator in self.hass.data[DOMAIN].items():
-                if hasattr(coordinator, 'data') and 'firmware' in coordinator.data:
-                    firmware_data = coordinator.data['firmware']
-                    current_version = firmware_data.get("current_version", "Inconnue")
-                    latest_version = firmware_data.get("latest_version", "Inconnue")
-                    upgrade_available = firmware_data.get("upgrade_available", False)
-                    
-                    if upgrade_available:
-                        self._attr_native_value = f"Mise à jour disponible ({latest_version})"
-                    else:
-                        self._attr_native_value = f"À jour ({current_version})"
-                    return
+        # Récupérer les données de firmware depuis le coordinateur de cette entrée
+        if firmware_data := self._coordinator_firmware():
+            current_version = firmware_data.get("current_version", "Inconnue")
+            latest_version = firmware_data.get("latest_version", "Inconnue")
+            upgrade_available = firmware_data.get("upgrade_available", False)
+
+            if upgrade_available:
+                self._set_native_value(f"Mise à jour disponible ({latest_version})")
+            else:
+                self._set_native_value(f"À jour ({current_version})")
+            return
         
         # Valeur par défaut si pas de données
-        self._attr_native_value = "Inconnue"
+        self._set_native_value("Inconnue")
+
+    def _coordinator_firmware(self) -> dict[str, Any] | None:
+        """Retourner les données firmware connues du coordinateur de l'entrée."""
+        if self.coordinator is None or not self.coordinator.data:
+            return None
+        return self.coordinator.data.get("firmware") or None
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -1366,18 +1314,15 @@ class StorcubeFirmwareSensor(StorcubeBatterySensor):
         if hasattr(self, '_firmware_data') and self._firmware_data:
             return self._firmware_data
         
-        # Sinon, essayer de récupérer depuis le coordinateur
-        if self.hass and DOMAIN in self.hass.data:
-            for entry_id, coordinator in self.hass.data[DOMAIN].items():
-                if hasattr(coordinator, 'data') and 'firmware' in coordinator.data:
-                    firmware_data = coordinator.data['firmware']
-                    return {
-                        "current_version": firmware_data.get("current_version", "Inconnue"),
-                        "latest_version": firmware_data.get("latest_version", "Inconnue"),
-                        "upgrade_available": firmware_data.get("upgrade_available", False),
-                        "firmware_notes": firmware_data.get("firmware_notes", []),
-                        "last_check": firmware_data.get("last_check", "Jamais"),
-                    }
+        # Sinon, essayer de récupérer depuis le coordinateur de cette entrée
+        if firmware_data := self._coordinator_firmware():
+            return {
+                "current_version": firmware_data.get("current_version", "Inconnue"),
+                "latest_version": firmware_data.get("latest_version", "Inconnue"),
+                "upgrade_available": firmware_data.get("upgrade_available", False),
+                "firmware_notes": firmware_data.get("firmware_notes", []),
+                "last_check": firmware_data.get("last_check", "Jamais"),
+            }
         
         return {
             "current_version": "Inconnue",
@@ -1392,58 +1337,41 @@ class StorcubeFirmwareSensor(StorcubeBatterySensor):
         await super().async_added_to_hass()
         self.hass = self.hass  # Définir la référence hass
         
-        # Si pas de coordinateur, essayer de le récupérer depuis hass.data
-        if not self.coordinator and DOMAIN in self.hass.data:
-            for entry_id, coordinator in self.hass.data[DOMAIN].items():
-                self.coordinator = coordinator
-                break
-        
         if self.coordinator:
             self.async_on_remove(
-                self.coordinator.async_add_listener(self.async_write_ha_state)
+                self.coordinator.async_add_listener(self._handle_coordinator_update)
             )
 
-    async def async_update(self) -> None:
-        """Mettre à jour le capteur."""
-        if self.coordinator:
-            await self.coordinator.async_request_refresh()
-        else:
-            # Mise à jour manuelle si pas de coordinateur
-            self._update_value_from_sources()
-            self.async_write_ha_state()
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Ne réécrire l'état que si les données firmware du coordinateur ont changé."""
+        if firmware_data := self._coordinator_firmware():
+            self.apply_state_update({"firmware": firmware_data})
+            self.flush_state_update()
 
     @callback
-    def handle_state_update(self, payload: dict[str, Any]) -> None:
-        """Gérer les mises à jour d'état depuis le coordinateur."""
-        # Appeler la méthode parent pour les données WebSocket/REST
-        super().handle_state_update(payload)
-        
+    def apply_state_update(self, payload: dict[str, Any]) -> None:
+        """Appliquer les données firmware et websocket sans écrire l'état."""
         # Mettre à jour les données firmware si disponibles
         if "firmware" in payload:
             firmware_data = payload["firmware"]
-            current_version = firmware_data.get("current_version", "Inconnue")
-            latest_version = firmware_data.get("latest_version", "Inconnue")
             upgrade_available = firmware_data.get("upgrade_available", False)
-            firmware_notes = firmware_data.get("firmware_notes", [])
-            last_check = firmware_data.get("last_check", "Jamais")
-            
-            # Mettre à jour l'état principal
-            if upgrade_available:
-                self._attr_native_value = f"Mise à jour disponible ({latest_version})"
-            else:
-                self._attr_native_value = f"À jour ({current_version})"
-            
-            # Stocker les données firmware pour les attributs
-            self._firmware_data = {
-                "current_version": current_version,
-                "latest_version": latest_version,
+            firmware_data = {
+                "current_version": firmware_data.get("current_version", "Inconnue"),
+                "latest_version": firmware_data.get("latest_version", "Inconnue"),
                 "upgrade_available": upgrade_available,
-                "firmware_notes": firmware_notes,
-                "last_check": last_check
+                "firmware_notes": firmware_data.get("firmware_notes", []),
+                "last_check": firmware_data.get("last_check", "Jamais"),
             }
-            
-            _LOGGER.info("Capteur firmware mis à jour: %s (upgrade: %s)", 
-                        self._attr_native_value, upgrade_available)
-        
-        # Notifier Home Assistant du changement
-        self.async_write_ha_state() 
+
+            # Stocker les données firmware pour les attributs
+            if firmware_data != self._firmware_data:
+                self._firmware_data = firmware_data
+                self._dirty = True
+                # Mettre à jour l'état principal
+                self._update_value_from_sources()
+                _LOGGER.info("Capteur firmware mis à jour: %s (upgrade: %s)",
+                            self._attr_native_value, upgrade_available)
+
+        # La méthode parent recalcule l'état principal ; l'écriture se fait au flush
+        super().apply_state_update(payload)
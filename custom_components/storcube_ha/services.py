@@ -1,6 +1,8 @@
 """Services pour l'intégration Storcube Battery Monitor."""
 import voluptuous as vol
+from homeassistant.const import ATTR_CONFIG_ENTRY_ID
 from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv
 
 from .const import (
@@ -20,6 +22,7 @@ SERVICE_SET_THRESHOLD = "set_threshold"
 
 SET_POWER_SCHEMA = vol.Schema({
     vol.Required(ATTR_POWER): cv.positive_int,
+    vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
 })
 
 SET_THRESHOLD_SCHEMA = vol.Schema({
@@ -27,31 +30,45 @@ SET_THRESHOLD_SCHEMA = vol.Schema({
         vol.Coerce(int),
         vol.Range(min=0, max=100)
     ),
+    vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
 })
 
+CHECK_FIRMWARE_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+})
+
+def _get_coordinator(hass: HomeAssistant, call: ServiceCall):
+    """Retrouver le coordinateur visé par l'appel, sans parcourir les entrées."""
+    entries = hass.data.get(DOMAIN, {})
+    entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+    if entry_id is not None:
+        data = entries.get(entry_id)
+    else:
+        # Sans entrée précisée : la première configurée (cas d'une seule batterie)
+        data = next(iter(entries.values()), None)
+    if data is None:
+        raise HomeAssistantError("Aucune entrée StorCube chargée pour ce service")
+    return data["coordinator"]
+
 async def async_setup_services(hass: HomeAssistant) -> None:
     """Configurer les services pour l'intégration."""
-    coordinator = None
-    for entry_id, data in hass.data[DOMAIN].items():
-        coordinator = data
-        break
-
-    if not coordinator:
+    # Services communs à toutes les entrées : enregistrés une seule fois
+    if hass.services.has_service(DOMAIN, SERVICE_SET_POWER):
         return
 
     async def handle_set_power(call: ServiceCall) -> None:
         """Gérer le service set_power."""
         power = call.data[ATTR_POWER]
-        await coordinator.set_power_value(power)
+        await _get_coordinator(hass, call).set_power_value(power)
 
     async def handle_set_threshold(call: ServiceCall) -> None:
         """Gérer le service set_threshold."""
         threshold = call.data[ATTR_THRESHOLD]
-        await coordinator.set_threshold_value(threshold)
+        await _get_coordinator(hass, call).set_threshold_value(threshold)
 
     async def handle_check_firmware(call: ServiceCall) -> None:
         """Gérer le service check_firmware."""
-        firmware_info = await coordinator.check_firmware_upgrade()
+        firmware_info = await _get_coordinator(hass, call).check_firmware_upgrade()
         if firmware_info:
             # Retourner les informations dans les attributs du service
             call.data.update({
@@ -79,7 +96,7 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         DOMAIN,
         SERVICE_CHECK_FIRMWARE,
         handle_check_firmware,
-        schema=vol.Schema({}),  # Pas de paramètres requis
+        schema=CHECK_FIRMWARE_SCHEMA,
     )
 
 async def async_unload_services(hass: HomeAssistant) -> None: